@@ -6,36 +6,22 @@ import os
 import sys
 import types
 from contextlib import contextmanager
+from pathlib import Path
 from unittest.mock import AsyncMock
 
 import pytest
 
+# Put tests/ on sys.path so the shared ``_amplifier_stub`` helper imports
+# the same way it does in the other modules' suites.
+sys.path.insert(0, str(Path(__file__).parent))
+
+from _amplifier_stub import install as install_amplifier_core_stub  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Stub installation -- prefer real libraries, fall back to stubs
 # ---------------------------------------------------------------------------
 
 
-def _install_amplifier_core_stub() -> None:
-    if "amplifier_core" in sys.modules:
-        return
-    mod = types.ModuleType("amplifier_core")
-
-    class ToolResult:
-        def __init__(
-            self,
-            success: bool = True,
-            output: str | None = None,
-            error: dict | None = None,
-        ):
-            self.success = success
-            self.output = output
-            self.error = error
-
-    mod.ToolResult = ToolResult  # type: ignore[attr-defined]
-    mod.ModuleCoordinator = type("ModuleCoordinator", (), {})  # type: ignore[attr-defined]
-    sys.modules["amplifier_core"] = mod
-
-
 def _install_coincurve_stub() -> None:
     """Provide a deterministic coincurve stub only if the real library is unavailable."""
     if "coincurve" in sys.modules:
@@ -94,7 +80,7 @@ def _install_websockets_stub() -> None:
     sys.modules["websockets"] = mod
 
 
-_install_amplifier_core_stub()
+install_amplifier_core_stub()
 _install_coincurve_stub()
 _install_websockets_stub()
 
@@ -5,7 +5,7 @@ from typing import Any
 
 from amplifier_core import ModuleCoordinator
 
-from .client import BitcoinRpcClient, load_credentials
+from .client import BitcoinRpcClient, load_cache_config, load_credentials, load_pool_size
 from .tools import (
     ConsolidateUtxosTool,
     GenerateAddressTool,
@@ -33,11 +33,19 @@ async def mount(
             f" or both BITCOIN_RPC_USER and BITCOIN_RPC_PASSWORD. Details: {e}"
         ) from e
 
-    client = BitcoinRpcClient(f"http://{host}:{port}", user, password)
+    client = BitcoinRpcClient(
+        f"http://{host}:{port}",
+        user,
+        password,
+        pool_size=load_pool_size(config),
+        cache=load_cache_config(config),
+    )
+
+    split_tool = SplitUtxosTool(client)
 
     for tool in (
         ListUtxosTool(client),
-        SplitUtxosTool(client),
+        split_tool,
         ManageWalletTool(client),
         GenerateAddressTool(client),
         SendCoinsTool(client),
@@ -47,6 +55,8 @@ async def mount(
         await coordinator.mount("tools", tool, name=tool.name)
 
     async def cleanup():
+        # Stop background address refills before the client they use goes away.
+        await split_tool.close()
         await client.close()
 
     return cleanup
@@ -2,35 +2,167 @@
 
 import logging
 import os
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from decimal import Decimal
 from typing import Any
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 8
+DEFAULT_CACHE_TTL = 2.0
+DEFAULT_CACHE_SIZE = 256
+
+# RPCs that can spend, lock or mine wallet coins, or swap the loaded wallet
+# set. Each one bumps ``BitcoinRpcClient.write_generation`` and empties the
+# read cache so no caller keeps serving pre-write wallet state.
+_WALLET_WRITE_METHODS = frozenset(
+    {
+        "send",
+        "sendall",
+        "sendmany",
+        "sendrawtransaction",
+        "sendtoaddress",
+        "lockunspent",
+        "bumpfee",
+        "abandontransaction",
+        "createwallet",
+        "loadwallet",
+        "unloadwallet",
+        "generatetoaddress",
+        "generateblock",
+    }
+)
+
+# Read-only RPCs whose responses may be served from the short-lived cache.
+# getbestblockhash is deliberately absent: callers poll it to notice new blocks.
+_CACHEABLE_METHODS = frozenset(
+    {
+        "getblockcount",
+        "getblockhash",
+        "listunspent",
+        "listwallets",
+        "listwalletdir",
+        "getwalletinfo",
+        "getbalance",
+        "getbalances",
+    }
+)
+
+# Cookie credentials by path, stored with the (inode, mtime, ctime) they were
+# read at. bitcoind only rewrites .cookie on restart, so a matching stat means
+# the cached pair is still current; ctime also catches permission changes.
+_cookie_cache: dict[str, tuple[tuple[int, int, int], tuple[str, str]]] = {}
+
+
+@dataclass(frozen=True)
+class RPCCacheConfig:
+    """Settings for BitcoinRpcClient's read-only response cache.
+
+    ``ttl`` is how long a response is reused, in seconds; ``size`` caps the
+    number of distinct (method, wallet, params) entries held at once.
+    """
+
+    enabled: bool = True
+    ttl: float = DEFAULT_CACHE_TTL
+    size: int = DEFAULT_CACHE_SIZE
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback: emit Decimal params as exact JSON number literals."""
+    if isinstance(obj, Decimal):
+        return orjson.Fragment(format(obj, "f").encode())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _envelope(method: str, encoded_params: bytes) -> bytes:
+    """Splice a method name and pre-encoded params into a JSON-RPC request body.
+
+    RPC method names are plain ASCII identifiers, so they need no escaping.
+    """
+    name = method.encode()
+    return (
+        b'{"jsonrpc":"1.0","id":"amplifier_'
+        + name
+        + b'","method":"'
+        + name
+        + b'","params":'
+        + encoded_params
+        + b"}"
+    )
+
 
 class BitcoinRpcClient:
     """Thin async client for Bitcoin Core JSON-RPC.
 
     Holds a single httpx.AsyncClient (lazy-initialized on first call)
     and exposes one ``rpc()`` method that all tool classes share.
+
+    ``pool_size`` caps the keep-alive connections kept open to the node;
+    up to twice that many may be open at once under concurrent calls.
+
+    Responses to read-only RPCs are reused as set by ``cache`` (an
+    ``RPCCacheConfig``; defaults apply when omitted). Any wallet write
+    through the client empties the cache.
     """
 
-    def __init__(self, url: str, user: str, password: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        user: str,
+        password: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        cache: RPCCacheConfig | None = None,
+    ) -> None:
         self._url = url
         self._user = user
         self._password = password
+        self._pool_size = pool_size
         self._client: httpx.AsyncClient | None = None
+        self._write_generation = 0
+        self._cache = cache if cache is not None else RPCCacheConfig()
+        self._read_cache: dict[tuple[str, str, bytes], tuple[float, bytes]] = {}
+        self._chain: str | None = None
 
     @property
     def url(self) -> str:
         return self._url
 
+    @property
+    def write_generation(self) -> int:
+        """Counter bumped after every RPC that may change wallet coins."""
+        return self._write_generation
+
+    async def chain(self) -> str:
+        """Return the node's chain name ("main", "regtest", ...), fetched once."""
+        chain = self._chain
+        if chain is None:
+            info = await self.rpc("getblockchaininfo")
+            chain = self._chain = info["chain"]
+        return chain
+
     def _ensure_client(self) -> httpx.AsyncClient:
         if self._client is None:
+            # bitcoind speaks HTTP/1.1 with keep-alive and does not pipeline.
+            # Transport-level retries stay off: a retried wallet RPC could
+            # repeat a send, and retries would hide connection problems.
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_keepalive_connections=self._pool_size,
+                    max_connections=self._pool_size * 2,
+                    keepalive_expiry=60.0,
+                ),
+                retries=0,
+            )
             self._client = httpx.AsyncClient(
                 auth=(self._user, self._password),
+                headers={"Content-Type": "application/json"},
                 timeout=30.0,
+                transport=transport,
             )
         return self._client
 
@@ -49,27 +181,110 @@ class BitcoinRpcClient:
         """
         url = f"{self._url}/wallet/{wallet}" if wallet else self._url
 
-        payload = {
-            "jsonrpc": "1.0",
-            "id": f"amplifier_{method}",
-            "method": method,
-            "params": params if params is not None else [],
-        }
+        encoded_params = orjson.dumps(params if params is not None else [], default=_json_default)
+
+        cache_key = None
+        cache = self._cache
+        if cache.enabled and cache.ttl > 0 and method in _CACHEABLE_METHODS:
+            cache_key = (method, wallet, encoded_params)
+            cached = self._read_cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                logger.debug("RPC cache hit: %s wallet=%r", method, wallet)
+                # Decoded fresh on every hit so callers never share mutable results.
+                return orjson.loads(cached[1])["result"]
 
         logger.debug("RPC request: %s params=%d wallet=%r", method, len(params or []), wallet)
 
+        generation = self._write_generation
         client = self._ensure_client()
-        response = await client.post(url, json=payload)
+        try:
+            response = await client.post(url, content=_envelope(method, encoded_params))
+        finally:
+            # Bumped after the call so a concurrent reader cannot cache
+            # pre-write state under the new generation. Failures count too,
+            # since the node may have applied the write before erroring.
+            if method in _WALLET_WRITE_METHODS:
+                self._write_generation += 1
+                self._read_cache.clear()
         response.raise_for_status()
 
-        logger.debug("RPC response: %s -> %d bytes", method, len(response.text))
+        logger.debug("RPC response: %s -> %d bytes", method, len(response.content))
 
-        data = response.json()
+        data = orjson.loads(response.content)
         if data.get("error"):
             logger.error("RPC error: %s -> %s", method, data["error"])
             raise RuntimeError(f"RPC error: {data['error']}")
+        # Skip caching if a write landed while this read was in flight.
+        if cache_key is not None and generation == self._write_generation:
+            if cache_key not in self._read_cache and len(self._read_cache) >= cache.size:
+                # Evict the oldest entry; dicts keep insertion order.
+                del self._read_cache[next(iter(self._read_cache))]
+            self._read_cache[cache_key] = (time.monotonic() + cache.ttl, response.content)
         return data["result"]
 
+    async def rpc_batch(
+        self,
+        calls: list[tuple[str, list[Any]]],
+        wallet: str = "",
+    ) -> list[Any]:
+        """Send several JSON-RPC requests in one HTTP POST and return their results.
+
+        ``calls`` is a list of ``(method, params)`` pairs. Results are returned
+        in the same order as ``calls``, matched to requests by ``id``.
+
+        Raises:
+            httpx.HTTPStatusError: on non-2xx HTTP response
+            httpx.RequestError: on connection failure
+            RuntimeError: if the batch, or any request in it, returns a JSON-RPC error
+        """
+        if not calls:
+            return []
+
+        url = f"{self._url}/wallet/{wallet}" if wallet else self._url
+
+        payload = [
+            {
+                "jsonrpc": "1.0",
+                "id": f"amplifier_{i}_{method}",
+                "method": method,
+                "params": params,
+            }
+            for i, (method, params) in enumerate(calls)
+        ]
+
+        logger.debug("RPC batch request: %d call(s) wallet=%r", len(calls), wallet)
+
+        client = self._ensure_client()
+        try:
+            response = await client.post(url, content=orjson.dumps(payload, default=_json_default))
+        finally:
+            if any(method in _WALLET_WRITE_METHODS for method, _ in calls):
+                self._write_generation += 1
+                self._read_cache.clear()
+        response.raise_for_status()
+
+        logger.debug(
+            "RPC batch response: %d call(s) -> %d bytes", len(calls), len(response.content)
+        )
+
+        reply = orjson.loads(response.content)
+        if not isinstance(reply, list):
+            # A rejected batch comes back as one error object, not a list.
+            error = reply.get("error") if isinstance(reply, dict) else None
+            logger.error("RPC error: batch of %d call(s) -> %s", len(calls), error or reply)
+            raise RuntimeError(f"RPC error: {error or reply}")
+        by_id = {entry["id"]: entry for entry in reply}
+        results = []
+        for request in payload:
+            entry = by_id.get(request["id"])
+            if entry is None:
+                raise RuntimeError(f"RPC error: no response for batched {request['method']}")
+            if entry.get("error"):
+                logger.error("RPC error: %s -> %s", request["method"], entry["error"])
+                raise RuntimeError(f"RPC error: {entry['error']}")
+            results.append(entry["result"])
+        return results
+
     async def close(self) -> None:
         """Close the underlying HTTP client if it was created."""
         if self._client is not None:
@@ -77,13 +292,82 @@ class BitcoinRpcClient:
             self._client = None
 
 
-def load_credentials(config: dict) -> tuple[str, str]:
-    """Resolve RPC credentials from cookie file or explicit env vars."""
-    cookie_file = config.get("cookie_file") or os.environ.get("BITCOIN_COOKIE_FILE")
+def _config_number(
+    config: dict, env: Mapping[str, str], key: str, env_var: str, default: Any, parse: type
+) -> Any:
+    """Parse a numeric setting from ``config[key]``, else ``env[env_var]``, else ``default``.
+
+    None and "" count as unset, like the ``or`` fallbacks in mount(); an
+    explicit 0 is kept.
+    """
+    raw = config.get(key)
+    if raw is None or raw == "":
+        raw = env.get(env_var) or default
+    try:
+        return parse(raw)
+    except (TypeError, ValueError) as err:
+        raise ValueError(
+            f"Invalid {key} / {env_var} value {raw!r}: expected {parse.__name__}"
+        ) from err
+
+
+def load_cache_config(config: dict, env: Mapping[str, str] | None = None) -> RPCCacheConfig:
+    """Resolve read-cache settings from config keys or env vars.
+
+    ``rpc_cache_ttl`` / BITCOIN_RPC_CACHE_TTL of 0 disables the cache;
+    ``rpc_cache_size`` / BITCOIN_RPC_CACHE_SIZE caps its entries (0 also
+    disables it).  Unparseable values raise ValueError naming the setting.
+    """
+    if env is None:
+        env = os.environ
+    ttl = _config_number(
+        config, env, "rpc_cache_ttl", "BITCOIN_RPC_CACHE_TTL", DEFAULT_CACHE_TTL, float
+    )
+    size = _config_number(
+        config, env, "rpc_cache_size", "BITCOIN_RPC_CACHE_SIZE", DEFAULT_CACHE_SIZE, int
+    )
+    return RPCCacheConfig(enabled=ttl > 0 and size > 0, ttl=ttl, size=size)
+
+
+def load_pool_size(config: dict, env: Mapping[str, str] | None = None) -> int:
+    """Resolve the keep-alive pool size from ``rpc_pool_size`` / BITCOIN_RPC_POOL_SIZE."""
+    if env is None:
+        env = os.environ
+    pool_size = _config_number(
+        config, env, "rpc_pool_size", "BITCOIN_RPC_POOL_SIZE", DEFAULT_POOL_SIZE, int
+    )
+    if pool_size < 1:
+        raise ValueError(f"Invalid rpc_pool_size / BITCOIN_RPC_POOL_SIZE value {pool_size!r}")
+    return pool_size
+
+
+def load_credentials(config: dict, env: Mapping[str, str] | None = None) -> tuple[str, str]:
+    """Resolve RPC credentials from cookie file or explicit env vars.
+
+    ``env`` defaults to ``os.environ``; pass a mapping to resolve against
+    other variables without touching the process environment.
+    """
+    if env is None:
+        env = os.environ
+    cookie_file = config.get("cookie_file") or env.get("BITCOIN_COOKIE_FILE")
     if cookie_file:
         try:
-            with open(cookie_file) as f:
-                content = f.read().strip()
+            st = os.stat(cookie_file)
+            stamp = (st.st_ino, st.st_mtime_ns, st.st_ctime_ns)
+            cached = _cookie_cache.get(cookie_file)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            # The cookie is ~80 ASCII bytes; a raw fd read skips the buffered
+            # text wrapper and its decoder.  Read until EOF so a longer
+            # file (or one rewritten since the stat) is never truncated.
+            fd = os.open(cookie_file, os.O_RDONLY)
+            try:
+                chunks = []
+                while chunk := os.read(fd, max(st.st_size, 256)):
+                    chunks.append(chunk)
+                content = b"".join(chunks).decode("ascii").strip()
+            finally:
+                os.close(fd)
         except FileNotFoundError as err:
             raise ValueError(
                 f"Cookie file not found at {cookie_file} -- check BITCOIN_COOKIE_FILE"
@@ -93,8 +377,9 @@ def load_credentials(config: dict) -> tuple[str, str]:
                 f"Permission denied reading cookie file at {cookie_file} -- check file permissions"
             ) from err
         user, password = content.split(":", 1)
+        _cookie_cache[cookie_file] = (stamp, (user, password))
         return user, password
     return (
-        config.get("rpc_user") or os.environ["BITCOIN_RPC_USER"],
-        config.get("rpc_password") or os.environ["BITCOIN_RPC_PASSWORD"],
+        config.get("rpc_user") or env["BITCOIN_RPC_USER"],
+        config.get("rpc_password") or env["BITCOIN_RPC_PASSWORD"],
     )
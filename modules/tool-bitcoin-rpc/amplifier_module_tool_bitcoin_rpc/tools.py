@@ -4,6 +4,13 @@ Each tool receives a shared ``BitcoinRpcClient`` instance and delegates
 all network I/O through its ``rpc()`` method.
 """
 
+import asyncio
+import heapq
+import logging
+from collections.abc import Callable
+from decimal import Decimal
+from itertools import chain, repeat
+from operator import itemgetter
 from typing import Any
 
 import httpx
@@ -11,170 +18,424 @@ from amplifier_core import ToolResult
 
 from .client import BitcoinRpcClient
 
+logger = logging.getLogger(__name__)
+
+# Coinbase subsidy schedule: 50 BTC, halved every interval. Regtest halves
+# every 150 blocks; every other chain uses the mainnet interval.
+_INITIAL_SUBSIDY_SATS = 5_000_000_000
+_MAINNET_HALVING_INTERVAL = 210_000
+_HALVING_INTERVALS = {"regtest": 150}
+
+# Bitcoin Core's own default for listunspent's maxconf argument.
+_LISTUNSPENT_MAX_CONF = 9_999_999
+
+# Rows rendered by list_utxos unless the caller asks for more.
+_DEFAULT_MAX_ROWS = 200
+
+# split_utxos keeps this many pre-generated default destinations per wallet,
+# refilling in the background once the pool drops to the low watermark.
+_ADDRESS_POOL_SIZE = 4
+_ADDRESS_POOL_LOW_WATERMARK = 1
+
+# (address, sats, amount, confirmations, txid, vout) -- one list_utxos table row.
+_UtxoEntry = tuple[str, int, float, int, str, int]
+
+_UTXO_HEADER = (
+    "| # | Address | Sats | BTC | Confs | Outpoint |",
+    "|--:|---------|-----:|----:|------:|----------|",
+)
+_ROW_FMT = "| {i} | {addr} | {sats:,} | {btc:.8f} | {confs} | {txid8}..{txidtail}:{vout} |"
+
+
+def _btc_to_sats(amount: float) -> int:
+    """Convert a BTC amount from an RPC response to integer satoshis exactly.
+
+    ``str()`` of a JSON-decoded float yields the shortest decimal that
+    round-trips, which for 8-decimal BTC amounts is the value bitcoind sent.
+    """
+    return int(Decimal(str(amount)) * 100_000_000)
+
+
+def _block_subsidy_sats(first_height: int, last_height: int, halving_interval: int) -> int:
+    """Total coinbase subsidy for blocks ``first_height..last_height`` inclusive.
+
+    Sums whole halving eras at a time, so the cost grows with the number of
+    eras spanned rather than the number of blocks.
+    """
+    total = 0
+    height = first_height
+    while height <= last_height:
+        era = height // halving_interval
+        era_end = min(last_height, (era + 1) * halving_interval - 1)
+        total += (era_end - height + 1) * (_INITIAL_SUBSIDY_SATS >> era)
+        height = era_end + 1
+    return total
+
+
+def _sats_to_btc(sats: int) -> Decimal:
+    """Convert integer satoshis to an exact BTC Decimal for RPC params.
+
+    The client encodes Decimal as a JSON number literal, so every digit
+    reaches the node without passing through a binary float.
+    """
+    return Decimal(sats).scaleb(-8)
+
+
+def _sats_to_btc_str(sats: int) -> str:
+    """Format integer satoshis as an exact 8-decimal BTC string for display."""
+    return f"{_sats_to_btc(sats):.8f}"
+
+
+def _http_status_error_message(exc: httpx.HTTPStatusError) -> str:
+    resp = exc.response
+    return f"RPC HTTP error {resp.status_code}: {resp.text}"
+
+
+def _request_error_message(exc: httpx.RequestError) -> str:
+    return f"Could not reach Bitcoin node: {exc}"
+
+
+# Message builders by exception type. httpx raises concrete subclasses
+# (ConnectError, ReadTimeout, ...); those are resolved once by isinstance
+# and then stored here, so repeat errors are a single dict lookup.
+_ERROR_MESSAGES: dict[type[BaseException], Callable[[Any], str]] = {
+    httpx.HTTPStatusError: _http_status_error_message,
+    httpx.RequestError: _request_error_message,
+}
+
 
 def _rpc_error_result(exc: Exception) -> ToolResult:
     """Convert an RPC-related exception into a structured ToolResult error.
 
-    Handles the three exception types raised by BitcoinRpcClient.rpc():
+    Handles the three exception types raised by BitcoinRpcClient.rpc() and rpc_batch():
     - httpx.HTTPStatusError  → HTTP-level failure (401, 500, etc.)
     - httpx.RequestError     → connection/network failure
     - RuntimeError           → JSON-RPC-level error from the node
     """
-    if isinstance(exc, httpx.HTTPStatusError):
-        resp = exc.response
-        return ToolResult(
-            success=False,
-            error={"message": f"RPC HTTP error {resp.status_code}: {resp.text}"},
-        )
-    if isinstance(exc, httpx.RequestError):
-        return ToolResult(
-            success=False,
-            error={"message": f"Could not reach Bitcoin node: {exc}"},
+    exc_type = type(exc)
+    build = _ERROR_MESSAGES.get(exc_type)
+    if build is None:
+        # RuntimeError (JSON-RPC error) or unexpected
+        build = next(
+            (fn for base, fn in _ERROR_MESSAGES.items() if isinstance(exc, base)),
+            str,
         )
-    # RuntimeError (JSON-RPC error) or unexpected
-    return ToolResult(success=False, error={"message": str(exc)})
+        _ERROR_MESSAGES[exc_type] = build
+    return ToolResult(success=False, error={"message": build(exc)})
 
 
 class ListUtxosTool:
     """List UTXOs from a Bitcoin Core wallet via RPC."""
 
-    def __init__(self, client: BitcoinRpcClient) -> None:
-        self._client = client
-
-    @property
-    def name(self) -> str:
-        return "list_utxos"
+    name = "list_utxos"
 
-    @property
-    def description(self) -> str:
-        return """List unspent transaction outputs (UTXOs) from a Bitcoin Core wallet.
+    description = """List unspent transaction outputs (UTXOs) from a Bitcoin Core wallet.
 
 Calls the Bitcoin Core RPC `listunspent` method and returns the full UTXO set
 for the specified wallet, including each output's txid, vout index, address,
 amount in BTC, and confirmation count.
 
 Use this to understand what funds are available before planning any UTXO splits
-or consolidations."""
-
-    @property
-    def input_schema(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "wallet": {
-                    "type": "string",
-                    "description": (
-                        "Name of the Bitcoin Core wallet to query. "
-                        "Leave empty to use the default wallet."
-                    ),
-                },
-                "min_confirmations": {
-                    "type": "integer",
-                    "description": (
-                        "Minimum confirmations required. Defaults to 0 (regtest-friendly)."
-                    ),
-                    "default": 0,
-                },
+or consolidations.
+
+Optional filters (confirmation range, addresses, minimum amount, maximum count,
+unsafe unconfirmed coins) are applied by the node itself, so only matching UTXOs are returned.
+
+At most `max_rows` rows (default 200) are rendered. Larger sets show the
+largest UTXOs by amount, followed by a count and total for the rest."""
+
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "wallet": {
+                "type": "string",
+                "description": (
+                    "Name of the Bitcoin Core wallet to query. "
+                    "Leave empty to use the default wallet."
+                ),
+            },
+            "min_confirmations": {
+                "type": "integer",
+                "description": (
+                    "Minimum confirmations required. Defaults to 0 (regtest-friendly)."
+                ),
+                "default": 0,
+            },
+            "max_confirmations": {
+                "type": "integer",
+                "description": "Maximum confirmations allowed. Defaults to no limit.",
             },
-            "required": [],
-        }
+            "addresses": {
+                "type": "array",
+                "description": "Only list UTXOs paying to one of these addresses.",
+                "items": {"type": "string"},
+            },
+            "min_amount_sats": {
+                "type": "integer",
+                "description": "Only list UTXOs worth at least this many satoshis.",
+            },
+            "max_count": {
+                "type": "integer",
+                "description": "Maximum number of UTXOs to return.",
+            },
+            "include_unsafe": {
+                "type": "boolean",
+                "description": (
+                    "Include unconfirmed UTXOs from outside the wallet or from "
+                    "replaceable transactions. Defaults to true."
+                ),
+                "default": True,
+            },
+            "max_rows": {
+                "type": "integer",
+                "description": (
+                    "Maximum number of table rows to render. Defaults to 200; "
+                    "beyond that only the largest UTXOs are listed."
+                ),
+                "default": _DEFAULT_MAX_ROWS,
+            },
+        },
+        "required": [],
+    }
+
+    def __init__(self, client: BitcoinRpcClient) -> None:
+        self._client = client
+
+    async def _fetch_entries(self, wallet: str, params: list[Any]) -> list[_UtxoEntry]:
+        """Call listunspent and return its entries as table rows sorted by address."""
+        utxos = await self._client.rpc("listunspent", params=params, wallet=wallet)
+
+        # Project each entry down to the columns the table shows and drop the
+        # decoded response: listunspent entries also carry scriptPubKey,
+        # descriptors and flags that would otherwise stay alive through the
+        # sort and format below.
+        entries = [
+            (
+                u.get("address", ""),
+                _btc_to_sats(u["amount"]),
+                u["amount"],
+                u["confirmations"],
+                u["txid"],
+                u["vout"],
+            )
+            for u in utxos
+        ]
+        del utxos
+        entries.sort(key=itemgetter(0))
+        return entries
 
     async def execute(self, input: dict[str, Any]) -> ToolResult:
         wallet = input.get("wallet", "")
         min_conf = input.get("min_confirmations", 0)
+        max_conf = input.get("max_confirmations", _LISTUNSPENT_MAX_CONF)
+        addresses = input.get("addresses", [])
+        min_amount_sats = input.get("min_amount_sats")
+        max_count = input.get("max_count")
+        include_unsafe = input.get("include_unsafe", True)
+        max_rows = input.get("max_rows", _DEFAULT_MAX_ROWS)
+
+        if not isinstance(max_rows, int) or max_rows < 1:
+            return ToolResult(
+                success=False,
+                error={"message": "'max_rows' must be a positive integer."},
+            )
+
+        # Filters go to bitcoind so it skips non-matching coins before
+        # serializing them, instead of shipping the whole set to filter here.
+        query_options: dict[str, Any] = {}
+        if min_amount_sats is not None:
+            query_options["minimumAmount"] = _sats_to_btc(min_amount_sats)
+        if max_count is not None:
+            query_options["maximumCount"] = max_count
+        params = [min_conf, max_conf, addresses, include_unsafe, query_options]
 
         try:
-            utxos = await self._client.rpc("listunspent", params=[min_conf], wallet=wallet)
+            # Repeat listings are served by the client's read cache.
+            entries = await self._fetch_entries(wallet, params)
         except (httpx.HTTPStatusError, httpx.RequestError, RuntimeError) as e:
             return _rpc_error_result(e)
 
-        if not utxos:
+        if not entries:
             label = f"wallet '{wallet}'" if wallet else "default wallet"
             return ToolResult(success=True, output=f"No UTXOs found in {label}.")
 
-        total_btc = sum(u["amount"] for u in utxos)
-        total_sats = int(round(total_btc * 100_000_000))
+        total_sats = sum(e[1] for e in entries)
 
-        utxos.sort(key=lambda u: u.get("address", ""))
+        summary = (
+            f"Found {len(entries)} UTXO(s) \u2014 {total_sats:,} sats "
+            f"({_sats_to_btc_str(total_sats)} BTC) total\n"
+        )
+        shown = entries
+        footer: tuple[str, ...] = ()
+        if len(entries) > max_rows:
+            # Top-N by amount without a full sort, then back into address order.
+            shown = sorted(heapq.nlargest(max_rows, entries, key=itemgetter(1)), key=itemgetter(0))
+            rest_sats = total_sats - sum(e[1] for e in shown)
+            footer = (
+                f"\n\u2026and {len(entries) - len(shown)} more UTXO(s) totaling "
+                f"{rest_sats:,} sats (raise `max_rows` to list them).",
+            )
 
-        lines = [
-            f"Found {len(utxos)} UTXO(s) \u2014 {total_sats:,} sats ({total_btc:.8f} BTC) total\n"
-        ]
-        lines.append("| # | Address | Sats | BTC | Confs | Outpoint |")
-        lines.append("|--:|---------|-----:|----:|------:|----------|")
-        for i, u in enumerate(utxos, 1):
-            sats = int(round(u["amount"] * 100_000_000))
-            addr = u.get("address", "unknown")
-            txid = u["txid"]
-            outpoint = f"{txid[:8]}..{txid[-4:]}:{u['vout']}"
-            lines.append(
-                f"| {i} | {addr} | {sats:,} | {u['amount']:.8f} | "
-                f"{u['confirmations']} | {outpoint} |"
+        row = _ROW_FMT.format
+        rows = (
+            row(
+                i=i,
+                addr=address or "unknown",
+                sats=sats,
+                btc=amount,
+                confs=confs,
+                txid8=txid[:8],
+                txidtail=txid[-4:],
+                vout=vout,
             )
+            for i, (address, sats, amount, confs, txid, vout) in enumerate(shown, 1)
+        )
 
-        return ToolResult(success=True, output="\n".join(lines))
+        output = "\n".join(chain((summary, *_UTXO_HEADER), rows, footer))
+        return ToolResult(success=True, output=output)
 
 
 class SplitUtxosTool:
     """Split wallet funds into discrete UTXOs via Bitcoin Core RPC."""
 
+    name = "split_utxos"
+
+    description = (
+        "Split wallet funds into multiple discrete UTXOs of specified amounts, "
+        "all sent to a single destination address. "
+        "Supply `address` to use a specific destination, or omit it to have "
+        "the wallet generate one automatically. "
+        "Set `fresh_address` to send every output to its own new wallet address instead. "
+        "Each output group repeats `count` times at `amount_sats` satoshis."
+    )
+
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "outputs": {
+                "type": "array",
+                "description": "List of output specifications to create.",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "amount_sats": {
+                            "type": "integer",
+                            "description": "Amount in satoshis for each UTXO.",
+                        },
+                        "count": {
+                            "type": "integer",
+                            "description": "Number of UTXOs to create at this amount.",
+                        },
+                    },
+                    "required": ["amount_sats", "count"],
+                },
+            },
+            "address": {
+                "type": "string",
+                "description": (
+                    "Destination address for all outputs. "
+                    "If omitted, a single new wallet address is generated."
+                ),
+            },
+            "fresh_address": {
+                "type": "boolean",
+                "description": (
+                    "If true, generate a new wallet address for every output "
+                    "instead of sending them all to one address. "
+                    "Cannot be combined with `address`. Defaults to false."
+                ),
+            },
+            "wallet": {
+                "type": "string",
+                "description": (
+                    "Name of the Bitcoin Core wallet to use. Leave empty to use the default wallet."
+                ),
+            },
+        },
+        "required": ["outputs"],
+    }
+
     def __init__(self, client: BitcoinRpcClient) -> None:
         self._client = client
+        self._address_pools: dict[str, asyncio.Queue[str]] = {}
+        self._refills: dict[str, asyncio.Task[None]] = {}
+
+    async def _get_new_addresses(self, n: int, wallet: str) -> list[str]:
+        """Generate ``n`` new wallet addresses in a single batched RPC round-trip."""
+        return await self._client.rpc_batch([("getnewaddress", [])] * n, wallet=wallet)
+
+    async def _resolve_addresses(
+        self,
+        outputs_spec: list[dict[str, Any]],
+        address: str | None,
+        fresh_address: bool,
+        wallet: str,
+    ) -> list[str]:
+        """Return one address per output if ``fresh_address``, else the single destination."""
+        if fresh_address:
+            return await self._get_new_addresses(
+                sum(spec["count"] for spec in outputs_spec), wallet
+            )
+        if address:
+            return [address]
+        return [await self._take_address(wallet)]
 
-    @property
-    def name(self) -> str:
-        return "split_utxos"
-
-    @property
-    def description(self) -> str:
-        return (
-            "Split wallet funds into multiple discrete UTXOs of specified amounts, "
-            "all sent to a single destination address. "
-            "Supply `address` to use a specific destination, or omit it to have "
-            "the wallet generate one automatically. "
-            "Each output group repeats `count` times at `amount_sats` satoshis."
+    async def _take_address(self, wallet: str) -> str:
+        """Return a pre-generated address for ``wallet``, or a new one if the pool is empty."""
+        pool = self._address_pools.setdefault(wallet, asyncio.Queue())
+        try:
+            address = pool.get_nowait()
+        except asyncio.QueueEmpty:
+            address = await self._client.rpc("getnewaddress", wallet=wallet)
+        if pool.qsize() <= _ADDRESS_POOL_LOW_WATERMARK and wallet not in self._refills:
+            self._refills[wallet] = asyncio.create_task(self._refill_addresses(wallet, pool))
+        return address
+
+    async def _refill_addresses(self, wallet: str, pool: asyncio.Queue[str]) -> None:
+        """Top ``pool`` back up to ``_ADDRESS_POOL_SIZE`` with one batched call."""
+        try:
+            for address in await self._get_new_addresses(_ADDRESS_POOL_SIZE - pool.qsize(), wallet):
+                pool.put_nowait(address)
+        except (httpx.HTTPStatusError, httpx.RequestError, RuntimeError) as e:
+            # The next execute() falls back to a direct getnewaddress.
+            logger.debug("Address pool refill failed for wallet %r: %s", wallet, e)
+        finally:
+            self._refills.pop(wallet, None)
+
+    async def _send_raw(self, outputs_list: list[dict[str, Decimal]], wallet: str) -> Any:
+        """Broadcast ``outputs_list`` via the raw transaction pipeline.
+
+        Bitcoin Core's `send` rejects repeated addresses in its outputs, but
+        createrawtransaction accepts them as separate output objects, so
+        repeated-destination splits go create -> fund -> sign -> send.
+        """
+        raw_hex = await self._client.rpc(
+            "createrawtransaction",
+            params=[[], outputs_list],
+            wallet=wallet,
+        )
+        funded = await self._client.rpc(
+            "fundrawtransaction",
+            params=[raw_hex],
+            wallet=wallet,
+        )
+        signed = await self._client.rpc(
+            "signrawtransactionwithwallet",
+            params=[funded["hex"]],
+            wallet=wallet,
+        )
+        return await self._client.rpc(
+            "sendrawtransaction",
+            params=[signed["hex"]],
+            wallet=wallet,
         )
 
-    @property
-    def input_schema(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "outputs": {
-                    "type": "array",
-                    "description": "List of output specifications to create.",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "amount_sats": {
-                                "type": "integer",
-                                "description": "Amount in satoshis for each UTXO.",
-                            },
-                            "count": {
-                                "type": "integer",
-                                "description": "Number of UTXOs to create at this amount.",
-                            },
-                        },
-                        "required": ["amount_sats", "count"],
-                    },
-                },
-                "address": {
-                    "type": "string",
-                    "description": (
-                        "Destination address for all outputs. "
-                        "If omitted, a single new wallet address is generated."
-                    ),
-                },
-                "wallet": {
-                    "type": "string",
-                    "description": (
-                        "Name of the Bitcoin Core wallet to use. "
-                        "Leave empty to use the default wallet."
-                    ),
-                },
-            },
-            "required": ["outputs"],
-        }
+    async def close(self) -> None:
+        """Cancel any in-flight address pool refills."""
+        refills = list(self._refills.values())
+        for task in refills:
+            task.cancel()
+        await asyncio.gather(*refills, return_exceptions=True)
 
     async def execute(self, input: dict[str, Any]) -> ToolResult:
         outputs_spec = input.get("outputs", [])
@@ -182,47 +443,79 @@ class SplitUtxosTool:
             return ToolResult(success=False, error={"message": "'outputs' must be an array."})
         wallet = input.get("wallet", "")
         default_address = input.get("address")
+        fresh_address = input.get("fresh_address", False)
 
         if not outputs_spec:
             return ToolResult(success=False, error={"message": "No outputs specified."})
+        if fresh_address and default_address:
+            return ToolResult(
+                success=False,
+                error={"message": "'address' and 'fresh_address' cannot be used together."},
+            )
+
+        requested_sats = sum(spec["amount_sats"] * spec["count"] for spec in outputs_spec)
 
         try:
-            if not default_address:
-                default_address = await self._client.rpc("getnewaddress", wallet=wallet)
+            wallet_info = await self._client.rpc("getwalletinfo", wallet=wallet)
         except (httpx.HTTPStatusError, httpx.RequestError, RuntimeError) as e:
             return _rpc_error_result(e)
 
-        address_amounts: list[tuple[str, float]] = []
-        for spec in outputs_spec:
-            amount_sats = spec["amount_sats"]
-            count = spec["count"]
-            btc_amount = amount_sats / 100_000_000
-            for _ in range(count):
-                address_amounts.append((default_address, btc_amount))
-
-        outputs_list = [{addr: round(amount, 8)} for addr, amount in address_amounts]
+        balance = wallet_info.get("balance")
+        if balance is not None and requested_sats > _btc_to_sats(balance):
+            return ToolResult(
+                success=False,
+                error={
+                    "message": (
+                        f"Insufficient funds: outputs total {requested_sats:,} sats "
+                        f"but wallet balance is {_btc_to_sats(balance):,} sats."
+                    )
+                },
+            )
 
+        # Addresses are only taken once the split can go ahead, so a rejected
+        # split never draws from the keypool.
         try:
-            raw_hex = await self._client.rpc(
-                "createrawtransaction",
-                params=[[], outputs_list],
-                wallet=wallet,
+            addresses = await self._resolve_addresses(
+                outputs_spec, default_address, fresh_address, wallet
             )
-            funded = await self._client.rpc(
-                "fundrawtransaction",
-                params=[raw_hex],
-                wallet=wallet,
+        except (httpx.HTTPStatusError, httpx.RequestError, RuntimeError) as e:
+            return _rpc_error_result(e)
+
+        address_amounts: list[tuple[str, int]]
+        outputs_list: list[dict[str, Decimal]]
+        if fresh_address:
+            amounts = chain.from_iterable(
+                repeat(spec["amount_sats"], spec["count"]) for spec in outputs_spec
             )
-            signed = await self._client.rpc(
-                "signrawtransactionwithwallet",
-                params=[funded["hex"]],
-                wallet=wallet,
+            btc_amounts = chain.from_iterable(
+                repeat(_sats_to_btc(spec["amount_sats"]), spec["count"]) for spec in outputs_spec
             )
-            result = await self._client.rpc(
-                "sendrawtransaction",
-                params=[signed["hex"]],
-                wallet=wallet,
+            address_amounts = list(zip(addresses, amounts, strict=True))
+            outputs_list = [{addr: btc} for addr, btc in zip(addresses, btc_amounts, strict=True)]
+        else:
+            destination = addresses[0]
+            # Every output in a group is identical, so each group shares one
+            # dict object rather than allocating ``count`` equal dicts.
+            outputs_list = list(
+                chain.from_iterable(
+                    repeat({destination: _sats_to_btc(spec["amount_sats"])}, spec["count"])
+                    for spec in outputs_spec
+                )
+            )
+            address_amounts = list(
+                chain.from_iterable(
+                    repeat((destination, spec["amount_sats"]), spec["count"])
+                    for spec in outputs_spec
+                )
             )
+
+        try:
+            if fresh_address or len(outputs_list) == 1:
+                # Every output pays a distinct address, so the wallet's `send`
+                # RPC can create, fund, sign and broadcast in one round-trip.
+                result = await self._client.rpc("send", params=[outputs_list], wallet=wallet)
+            else:
+                result = await self._send_raw(outputs_list, wallet)
         except (httpx.HTTPStatusError, httpx.RequestError, RuntimeError) as e:
             return _rpc_error_result(e)
 
@@ -230,8 +523,7 @@ class SplitUtxosTool:
 
         lines = [f"Transaction broadcast: {txid}\n"]
         lines.append(f"Created {len(address_amounts)} UTXO(s):\n")
-        for i, (addr, btc) in enumerate(address_amounts, 1):
-            sats = int(btc * 100_000_000)
+        for i, (addr, sats) in enumerate(address_amounts, 1):
             lines.append(f"  {i}.  {sats:,} sats  ->  {addr}")
         lines.append("\nChange returned to wallet automatically.")
 
@@ -241,16 +533,9 @@ class SplitUtxosTool:
 class ManageWalletTool:
     """Create, load, unload, and inspect Bitcoin Core wallets via RPC."""
 
-    def __init__(self, client: BitcoinRpcClient) -> None:
-        self._client = client
-
-    @property
-    def name(self) -> str:
-        return "manage_wallet"
+    name = "manage_wallet"
 
-    @property
-    def description(self) -> str:
-        return """Create, load, unload, and inspect Bitcoin Core wallets.
+    description = """Create, load, unload, and inspect Bitcoin Core wallets.
 
 Actions:
 - list:   Show all wallets on disk and which are currently loaded.
@@ -261,23 +546,24 @@ Actions:
 
 The `wallet` parameter is required for every action except `list`."""
 
-    @property
-    def input_schema(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "action": {
-                    "type": "string",
-                    "enum": ["list", "info", "create", "load", "unload"],
-                    "description": "Wallet operation to perform.",
-                },
-                "wallet": {
-                    "type": "string",
-                    "description": "Wallet name. Required for all actions except list.",
-                },
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "action": {
+                "type": "string",
+                "enum": ["list", "info", "create", "load", "unload"],
+                "description": "Wallet operation to perform.",
+            },
+            "wallet": {
+                "type": "string",
+                "description": "Wallet name. Required for all actions except list.",
             },
-            "required": ["action"],
-        }
+        },
+        "required": ["action"],
+    }
+
+    def __init__(self, client: BitcoinRpcClient) -> None:
+        self._client = client
 
     async def execute(self, input: dict[str, Any]) -> ToolResult:
         action = input.get("action")
@@ -291,11 +577,15 @@ The `wallet` parameter is required for every action except `list`."""
 
         try:
             if action == "list":
-                loaded = await self._client.rpc("listwallets")
-                on_disk = [w["name"] for w in (await self._client.rpc("listwalletdir"))["wallets"]]
+                # One batched POST: both calls are independent reads.
+                loaded, wallet_dir = await self._client.rpc_batch(
+                    [("listwallets", []), ("listwalletdir", [])]
+                )
+                on_disk = [w["name"] for w in wallet_dir["wallets"]]
+                loaded_set = set(loaded)
                 lines = ["Wallets on disk:"]
                 for name in on_disk:
-                    tag = " (loaded)" if name in loaded else ""
+                    tag = " (loaded)" if name in loaded_set else ""
                     display = (
                         f'"{name}"'
                         if name
@@ -355,16 +645,9 @@ The `wallet` parameter is required for every action except `list`."""
 class GenerateAddressTool:
     """Generate a new Bitcoin address from a wallet via RPC."""
 
-    def __init__(self, client: BitcoinRpcClient) -> None:
-        self._client = client
-
-    @property
-    def name(self) -> str:
-        return "generate_address"
+    name = "generate_address"
 
-    @property
-    def description(self) -> str:
-        return """Generate a new Bitcoin address from a wallet.
+    description = """Generate a new Bitcoin address from a wallet.
 Calls `getnewaddress` on Bitcoin Core. Optionally accepts a label and address type.
 
 Address types:
@@ -373,29 +656,30 @@ Address types:
 - p2sh-segwit \u2014 wrapped SegWit (3...)
 - legacy   \u2014 pay-to-pubkey-hash (1...)"""
 
-    @property
-    def input_schema(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "label": {
-                    "type": "string",
-                    "description": "Optional label to attach to the address in the wallet.",
-                },
-                "address_type": {
-                    "type": "string",
-                    "enum": ["bech32", "bech32m", "p2sh-segwit", "legacy"],
-                    "description": "Address format. Defaults to the wallet's configured type.",
-                },
-                "wallet": {
-                    "type": "string",
-                    "description": (
-                        'Wallet to generate the address from. Pass "" for the default wallet.'
-                    ),
-                },
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "label": {
+                "type": "string",
+                "description": "Optional label to attach to the address in the wallet.",
+            },
+            "address_type": {
+                "type": "string",
+                "enum": ["bech32", "bech32m", "p2sh-segwit", "legacy"],
+                "description": "Address format. Defaults to the wallet's configured type.",
             },
-            "required": [],
-        }
+            "wallet": {
+                "type": "string",
+                "description": (
+                    'Wallet to generate the address from. Pass "" for the default wallet.'
+                ),
+            },
+        },
+        "required": [],
+    }
+
+    def __init__(self, client: BitcoinRpcClient) -> None:
+        self._client = client
 
     async def execute(self, input: dict[str, Any]) -> ToolResult:
         label = input.get("label", "")
@@ -423,54 +707,48 @@ Address types:
 class SendCoinsTool:
     """Send bitcoin to an address via Bitcoin Core RPC."""
 
-    def __init__(self, client: BitcoinRpcClient) -> None:
-        self._client = client
-
-    @property
-    def name(self) -> str:
-        return "send_coins"
+    name = "send_coins"
 
-    @property
-    def description(self) -> str:
-        return """Send bitcoin to a given address using `sendtoaddress`.
+    description = """Send bitcoin to a given address using `sendtoaddress`.
 
 The wallet selects inputs automatically and handles change.
 Amount is specified in satoshis. Set `subtract_fee_from_amount` to true
 to make the recipient receive exactly `amount_sats` with the fee taken from it,
 rather than on top."""
 
-    @property
-    def input_schema(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "address": {
-                    "type": "string",
-                    "description": "Destination Bitcoin address.",
-                },
-                "amount_sats": {
-                    "type": "integer",
-                    "description": "Amount to send in satoshis.",
-                },
-                "wallet": {
-                    "type": "string",
-                    "description": 'Wallet to send from. Pass "" for the default wallet.',
-                },
-                "comment": {
-                    "type": "string",
-                    "description": "Optional memo stored locally in the wallet (not on-chain).",
-                },
-                "subtract_fee_from_amount": {
-                    "type": "boolean",
-                    "description": (
-                        "If true, fee is deducted from the sent amount"
-                        " so the recipient gets exactly amount_sats"
-                        " minus fee. Defaults to false."
-                    ),
-                },
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "address": {
+                "type": "string",
+                "description": "Destination Bitcoin address.",
+            },
+            "amount_sats": {
+                "type": "integer",
+                "description": "Amount to send in satoshis.",
+            },
+            "wallet": {
+                "type": "string",
+                "description": 'Wallet to send from. Pass "" for the default wallet.',
             },
-            "required": ["address", "amount_sats"],
-        }
+            "comment": {
+                "type": "string",
+                "description": "Optional memo stored locally in the wallet (not on-chain).",
+            },
+            "subtract_fee_from_amount": {
+                "type": "boolean",
+                "description": (
+                    "If true, fee is deducted from the sent amount"
+                    " so the recipient gets exactly amount_sats"
+                    " minus fee. Defaults to false."
+                ),
+            },
+        },
+        "required": ["address", "amount_sats"],
+    }
+
+    def __init__(self, client: BitcoinRpcClient) -> None:
+        self._client = client
 
     async def execute(self, input: dict[str, Any]) -> ToolResult:
         address = input.get("address", "")
@@ -489,7 +767,7 @@ rather than on top."""
                 error={"message": "'amount_sats' must be an integer."},
             )
 
-        btc_amount = round(amount_sats / 100_000_000, 8)
+        btc_amount = _sats_to_btc(amount_sats)
 
         try:
             txid = await self._client.rpc(
@@ -513,16 +791,9 @@ rather than on top."""
 class ConsolidateUtxosTool:
     """Consolidate multiple UTXOs into a single output via Bitcoin Core RPC."""
 
-    def __init__(self, client: BitcoinRpcClient) -> None:
-        self._client = client
-
-    @property
-    def name(self) -> str:
-        return "consolidate_utxos"
+    name = "consolidate_utxos"
 
-    @property
-    def description(self) -> str:
-        return """Consolidate multiple UTXOs into a single output.
+    description = """Consolidate multiple UTXOs into a single output.
 
 Fetches UTXOs from the wallet (optionally filtered by minimum confirmations or a
 specific set of outpoints), then sweeps them into one output. If no address is
@@ -531,57 +802,59 @@ supplied, a new wallet address is generated automatically.
 The network fee is subtracted from the consolidated output amount automatically.
 
 Pass `outpoints` as an array of "txid:vout" strings to consolidate only specific
-UTXOs. Omit it to consolidate everything eligible in the wallet."""
-
-    @property
-    def input_schema(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "wallet": {
-                    "type": "string",
-                    "description": 'Wallet to consolidate. Pass "" for the default wallet.',
-                },
-                "address": {
-                    "type": "string",
-                    "description": (
-                        "Destination address for the consolidated"
-                        " output. Omit to generate a new wallet address."
-                    ),
-                },
-                "min_confirmations": {
-                    "type": "integer",
-                    "description": (
-                        "Only include UTXOs with at least this many confirmations. Defaults to 1."
-                    ),
-                    "default": 1,
-                },
-                "max_amount_sats": {
-                    "type": "integer",
-                    "description": (
-                        "Only consolidate UTXOs with an amount at or"
-                        " below this value in satoshis. E.g. pass 1000"
-                        " to consolidate all UTXOs under 1000 sats."
-                    ),
-                },
-                "min_amount_sats": {
-                    "type": "integer",
-                    "description": (
-                        "Only consolidate UTXOs with an amount at or above this value in satoshis."
-                    ),
-                },
-                "outpoints": {
-                    "type": "array",
-                    "description": (
-                        "Specific UTXOs to consolidate, as"
-                        ' "txid:vout" strings. Omit to use all'
-                        " eligible UTXOs."
-                    ),
-                    "items": {"type": "string"},
-                },
+UTXOs; the call fails, naming them, if any are not eligible. Omit it to
+consolidate everything eligible in the wallet."""
+
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "wallet": {
+                "type": "string",
+                "description": 'Wallet to consolidate. Pass "" for the default wallet.',
+            },
+            "address": {
+                "type": "string",
+                "description": (
+                    "Destination address for the consolidated"
+                    " output. Omit to generate a new wallet address."
+                ),
+            },
+            "min_confirmations": {
+                "type": "integer",
+                "description": (
+                    "Only include UTXOs with at least this many confirmations. Defaults to 1."
+                ),
+                "default": 1,
+            },
+            "max_amount_sats": {
+                "type": "integer",
+                "description": (
+                    "Only consolidate UTXOs with an amount at or"
+                    " below this value in satoshis. E.g. pass 1000"
+                    " to consolidate all UTXOs under 1000 sats."
+                ),
+            },
+            "min_amount_sats": {
+                "type": "integer",
+                "description": (
+                    "Only consolidate UTXOs with an amount at or above this value in satoshis."
+                ),
             },
-            "required": [],
-        }
+            "outpoints": {
+                "type": "array",
+                "description": (
+                    "Specific UTXOs to consolidate, as"
+                    ' "txid:vout" strings. Omit to use all'
+                    " eligible UTXOs."
+                ),
+                "items": {"type": "string"},
+            },
+        },
+        "required": [],
+    }
+
+    def __init__(self, client: BitcoinRpcClient) -> None:
+        self._client = client
 
     async def execute(self, input: dict[str, Any]) -> ToolResult:
         wallet = input.get("wallet", "")
@@ -592,7 +865,18 @@ UTXOs. Omit it to consolidate everything eligible in the wallet."""
         min_amount_sats = input.get("min_amount_sats")
 
         try:
-            all_utxos = await self._client.rpc("listunspent", [min_conf], wallet=wallet)
+            # A change address does not depend on the UTXO set, so it is
+            # requested alongside listunspent rather than after filtering.
+            if address:
+                all_utxos = await self._client.rpc("listunspent", [min_conf], wallet=wallet)
+            else:
+                all_utxos, address = await asyncio.gather(
+                    self._client.rpc("listunspent", [min_conf], wallet=wallet),
+                    self._client.rpc("getnewaddress", wallet=wallet),
+                    return_exceptions=True,
+                )
+            if isinstance(all_utxos, BaseException):
+                raise all_utxos
 
             if not all_utxos:
                 label = f"wallet '{wallet}'" if wallet else "default wallet"
@@ -602,7 +886,8 @@ UTXOs. Omit it to consolidate everything eligible in the wallet."""
                 )
 
             if outpoints:
-                parsed: set[tuple[str, int]] = set()
+                # dict keeps the caller's order and drops repeated outpoints.
+                parsed: dict[tuple[str, int], str] = {}
                 for op in outpoints:
                     parts = op.rsplit(":", 1)
                     if len(parts) != 2 or not parts[1].isdigit():
@@ -612,9 +897,10 @@ UTXOs. Omit it to consolidate everything eligible in the wallet."""
                                 "message": f"Invalid outpoint '{op}'. Expected format: 'txid:vout'."
                             },
                         )
-                    parsed.add((parts[0], int(parts[1])))
+                    parsed[(parts[0], int(parts[1]))] = op
 
-                selected = [u for u in all_utxos if (u["txid"], u["vout"]) in parsed]
+                index = {(u["txid"], u["vout"]): u for u in all_utxos}
+                selected = [index[key] for key in parsed if key in index]
                 if not selected:
                     return ToolResult(
                         success=False,
@@ -625,30 +911,40 @@ UTXOs. Omit it to consolidate everything eligible in the wallet."""
                             )
                         },
                     )
+                if len(selected) != len(parsed):
+                    missing = ", ".join(op for key, op in parsed.items() if key not in index)
+                    return ToolResult(
+                        success=False,
+                        error={
+                            "message": (
+                                f"Outpoint(s) not found in the eligible UTXO set: {missing}. "
+                                "They may be spent, locked, or below min_confirmations."
+                            )
+                        },
+                    )
             else:
                 selected = all_utxos
 
-            if max_amount_sats is not None:
-                selected = [
-                    u for u in selected if int(round(u["amount"] * 100_000_000)) <= max_amount_sats
-                ]
-            if min_amount_sats is not None:
-                selected = [
-                    u for u in selected if int(round(u["amount"] * 100_000_000)) >= min_amount_sats
-                ]
-
-            if not selected:
+            # One pass applies the amount filters and builds the inputs and total.
+            inputs: list[dict[str, Any]] = []
+            total_sats = 0
+            for u in selected:
+                sats = _btc_to_sats(u["amount"])
+                if max_amount_sats is not None and sats > max_amount_sats:
+                    continue
+                if min_amount_sats is not None and sats < min_amount_sats:
+                    continue
+                inputs.append({"txid": u["txid"], "vout": u["vout"]})
+                total_sats += sats
+
+            if not inputs:
                 return ToolResult(
                     success=False,
                     error={"message": "No UTXOs matched the specified filters."},
                 )
 
-            if not address:
-                address = await self._client.rpc("getnewaddress", wallet=wallet)
-
-            total_btc = sum(u["amount"] for u in selected)
-            total_sats = int(round(total_btc * 100_000_000))
-            inputs = [{"txid": u["txid"], "vout": u["vout"]} for u in selected]
+            if isinstance(address, BaseException):
+                raise address
 
             result = await self._client.rpc(
                 "sendall",
@@ -665,14 +961,14 @@ UTXOs. Omit it to consolidate everything eligible in the wallet."""
             txid = result.get("txid", str(result)) if isinstance(result, dict) else str(result)
 
             lines = [
-                f"Consolidated {len(selected)} UTXO(s) \u2192 {address}",
+                f"Consolidated {len(inputs)} UTXO(s) \u2192 {address}",
                 f"Input total:  {total_sats:,} sats",
                 f"txid:         {txid}",
                 "\nFee deducted from output automatically."
                 " Run list_utxos after confirmation to see"
                 " the final amount.",
             ]
-            if len(selected) == 1:
+            if len(inputs) == 1:
                 lines.append(
                     "\nNote: Only 1 UTXO was selected \u2014"
                     " this just moves funds to a new address."
@@ -687,16 +983,9 @@ UTXOs. Omit it to consolidate everything eligible in the wallet."""
 class MineBlocksTool:
     """Mine regtest blocks to a specific address via Bitcoin Core RPC."""
 
-    def __init__(self, client: BitcoinRpcClient) -> None:
-        self._client = client
-
-    @property
-    def name(self) -> str:
-        return "mine_blocks"
+    name = "mine_blocks"
 
-    @property
-    def description(self) -> str:
-        return """Mine regtest blocks, directing the coinbase reward to a specific address.
+    description = """Mine regtest blocks, directing the coinbase reward to a specific address.
 
 Wraps `generatetoaddress`. Only works on regtest/signet \u2014 not mainnet.
 
@@ -705,28 +994,28 @@ blocks to it. Note that coinbase outputs require 100 confirmations before they
 appear in the wallet's spendable balance \u2014 mine at least 101 blocks to make the
 first reward immediately spendable."""
 
-    @property
-    def input_schema(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "num_blocks": {
-                    "type": "integer",
-                    "description": (
-                        "Number of blocks to mine. Mine 101+ to make"
-                        " coinbase spendable immediately."
-                    ),
-                },
-                "address": {
-                    "type": "string",
-                    "description": (
-                        "Address to send the coinbase reward to."
-                        " Generate one with generate_address first."
-                    ),
-                },
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "num_blocks": {
+                "type": "integer",
+                "description": (
+                    "Number of blocks to mine. Mine 101+ to make coinbase spendable immediately."
+                ),
+            },
+            "address": {
+                "type": "string",
+                "description": (
+                    "Address to send the coinbase reward to."
+                    " Generate one with generate_address first."
+                ),
             },
-            "required": ["num_blocks", "address"],
-        }
+        },
+        "required": ["num_blocks", "address"],
+    }
+
+    def __init__(self, client: BitcoinRpcClient) -> None:
+        self._client = client
 
     async def execute(self, input: dict[str, Any]) -> ToolResult:
         num_blocks = input.get("num_blocks")
@@ -746,15 +1035,26 @@ first reward immediately spendable."""
             )
 
         try:
-            block_hashes = await self._client.rpc("generatetoaddress", params=[num_blocks, address])
+            # Resolved before mining (and memoized after the first call) so a
+            # failed lookup can never report blocks that were already mined.
+            chain_name = await self._client.chain()
+            # getblockcount rides in the same batch, so it reports the tip
+            # right after these blocks without a second round trip.
+            block_hashes, tip_height = await self._client.rpc_batch(
+                [("generatetoaddress", [num_blocks, address]), ("getblockcount", [])]
+            )
         except (httpx.HTTPStatusError, httpx.RequestError, RuntimeError) as e:
             return _rpc_error_result(e)
 
-        # Assumes pre-halving coinbase reward (50 BTC). Regtest-only; informational.
-        reward_sats = num_blocks * 5_000_000_000
+        # Block subsidy only; fees paid to these coinbases are not included.
+        reward_sats = _block_subsidy_sats(
+            tip_height - len(block_hashes) + 1,
+            tip_height,
+            _HALVING_INTERVALS.get(chain_name, _MAINNET_HALVING_INTERVAL),
+        )
         lines = [
             f"Mined {num_blocks} block(s) \u2192 {address}",
-            f"Coinbase reward: {reward_sats:,} sats ({num_blocks * 50} BTC immature)",
+            f"Coinbase reward: {reward_sats:,} sats ({_sats_to_btc_str(reward_sats)} BTC immature)",
             f"First block: {block_hashes[0]}",
         ]
         if len(block_hashes) > 1:
@@ -0,0 +1,31 @@
+"""Minimal ``amplifier_core`` stand-in so the module imports without the real package.
+
+Defined at module level and registered by ``install()``; the first conftest
+to import this module does the work and every later import is a
+``sys.modules`` hit.
+"""
+
+import sys
+import types
+
+
+class ToolResult:
+    def __init__(
+        self,
+        success: bool = True,
+        output: str | None = None,
+        error: dict | None = None,
+    ):
+        self.success = success
+        self.output = output
+        self.error = error
+
+
+def install() -> None:
+    """Register the stub as ``amplifier_core`` unless a real or stub one is loaded."""
+    if "amplifier_core" in sys.modules:
+        return
+    mod = types.ModuleType("amplifier_core")
+    mod.ToolResult = ToolResult  # type: ignore[attr-defined]
+    mod.ModuleCoordinator = type("ModuleCoordinator", (), {})  # type: ignore[attr-defined]
+    sys.modules["amplifier_core"] = mod
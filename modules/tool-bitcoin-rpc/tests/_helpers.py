@@ -3,34 +3,62 @@
 Importable from any test module or conftest.py.
 """
 
+import ast
+from functools import cache, lru_cache
+from pathlib import Path
+
 import httpx
+import orjson
 
 RPC_URL = "http://127.0.0.1:18443"
 RPC_USER = "testuser"
 RPC_PASS = "testpass"
 
+PACKAGE_DIR = Path(__file__).resolve().parents[1] / "amplifier_module_tool_bitcoin_rpc"
+
+# Python 3.13+ can constant-fold while building the tree; older versions
+# fall back to a plain ast.parse-equivalent compile.
+_AST_FLAGS = ast.PyCF_ONLY_AST | getattr(ast, "PyCF_OPTIMIZED_AST", 0)
+
+
+# Every mocked response shares the same envelope; only result/error vary.
+_OK_HEAD = b'{"jsonrpc":"1.0","id":"amplifier_test","result":'
+_OK_TAIL = b',"error":null}'
+_ERR_HEAD = b'{"jsonrpc":"1.0","id":"amplifier_test","result":null,"error":'
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+@lru_cache(maxsize=128, typed=True)
+def _success_body(result):
+    return _OK_HEAD + orjson.dumps(result) + _OK_TAIL
+
+
+@lru_cache(maxsize=128)
+def _error_body(code, message):
+    return _ERR_HEAD + orjson.dumps({"code": code, "message": message}) + b"}"
+
 
 def rpc_success(result):
-    """Build an httpx.Response that looks like a JSON-RPC success."""
-    return httpx.Response(
-        200,
-        json={
-            "jsonrpc": "1.0",
-            "id": "amplifier_test",
-            "result": result,
-            "error": None,
-        },
-    )
+    """Build an httpx.Response that looks like a JSON-RPC success.
+
+    Bodies for hashable results (None, numbers, strings, ...) are encoded
+    once and reused; lists and dicts are encoded per call.
+    """
+    try:
+        body = _success_body(result)
+    except TypeError:
+        body = _OK_HEAD + orjson.dumps(result) + _OK_TAIL
+    return httpx.Response(200, content=body, headers=_JSON_HEADERS)
 
 
 def rpc_error(code, message):
     """Build an httpx.Response that looks like a JSON-RPC error."""
-    return httpx.Response(
-        200,
-        json={
-            "jsonrpc": "1.0",
-            "id": "amplifier_test",
-            "result": None,
-            "error": {"code": code, "message": message},
-        },
-    )
+    return httpx.Response(200, content=_error_body(code, message), headers=_JSON_HEADERS)
+
+
+@cache
+def parsed_source(name: str) -> tuple[str, ast.Module]:
+    """Source text and AST of a package module, read and parsed once per session."""
+    path = PACKAGE_DIR / name
+    source = path.read_text()
+    return source, compile(source, str(path), "exec", _AST_FLAGS)
@@ -5,51 +5,159 @@ Constants and response helpers live in ``_helpers.py`` so they can be
 imported by both conftest and test modules.
 """
 
+import errno
+import os
 import sys
-import types
+from contextlib import AsyncExitStack
 from pathlib import Path
 from unittest.mock import AsyncMock
 
+import httpx
 import pytest
+import pytest_asyncio
+import respx
 
 # Ensure tests/ directory is on sys.path so ``_helpers`` can be imported
 # when pytest is invoked from the repo root (where tests/ is not automatically
 # added).  This matches the pattern used by tool-lnd/tests/conftest.py.
 sys.path.insert(0, str(Path(__file__).parent))
 
-from _helpers import RPC_PASS, RPC_URL, RPC_USER, rpc_error, rpc_success  # noqa: E402, F401
+from _amplifier_stub import install as install_amplifier_core_stub  # noqa: E402
+from _helpers import (  # noqa: E402, F401
+    RPC_PASS,
+    RPC_URL,
+    RPC_USER,
+    parsed_source,
+    rpc_error,
+    rpc_success,
+)
 
+install_amplifier_core_stub()
 
-def _install_amplifier_core_stub():
-    if "amplifier_core" in sys.modules:
-        return
-    mod = types.ModuleType("amplifier_core")
+from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient  # noqa: E402
 
-    class ToolResult:
-        def __init__(self, success=True, output=None, error=None):
-            self.success = success
-            self.output = output
-            self.error = error
 
-    mod.ToolResult = ToolResult  # type: ignore[attr-defined]
-    mod.ModuleCoordinator = type("ModuleCoordinator", (), {})  # type: ignore[attr-defined]
-    sys.modules["amplifier_core"] = mod
+@pytest.fixture(scope="session")
+def init_tree():
+    """``(source, tree)`` for __init__.py, parsed once per session."""
+    return parsed_source("__init__.py")
 
 
-_install_amplifier_core_stub()
+@pytest.fixture(scope="session")
+def tools_tree():
+    """``(source, tree)`` for tools.py, parsed once per session."""
+    return parsed_source("tools.py")
+
+
+@pytest.fixture(scope="session")
+def client_tree():
+    """``(source, tree)`` for client.py, parsed once per session."""
+    return parsed_source("client.py")
 
-from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient  # noqa: E402
+
+@pytest.fixture(scope="session")
+def valid_cookie(tmp_path_factory):
+    """Path to a readable ``__cookie__:abc123secret`` cookie file, shared per session."""
+    path = tmp_path_factory.mktemp("cookies") / "valid.cookie"
+    path.write_text("__cookie__:abc123secret")
+    return path
+
+
+@pytest.fixture(scope="session")
+def _unreadable_cookie_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("cookies") / "unreadable.cookie"
+    path.write_text("user:pass")
+    return path
 
 
 @pytest.fixture
-def rpc_client():
-    """BitcoinRpcClient pointed at regtest default with dummy credentials."""
+def unreadable_cookie(_unreadable_cookie_path, monkeypatch):
+    """Path to a cookie file whose os.open() fails with EACCES.
+
+    The denial is simulated rather than done with chmod 000, which root
+    (and some CI sandboxes) can read straight through; every other path
+    still goes to the real os.open.
+    """
+    target = str(_unreadable_cookie_path)
+    real_open = os.open
+
+    def _open(path, flags, *args, **kwargs):
+        if os.fspath(path) == target:
+            raise PermissionError(errno.EACCES, "Permission denied", target)
+        return real_open(path, flags, *args, **kwargs)
+
+    monkeypatch.setattr(os, "open", _open)
+    return _unreadable_cookie_path
+
+
+@pytest.fixture(scope="module")
+def _module_rpc_client():
+    """One BitcoinRpcClient shared by a module's tests that never send a request."""
     return BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
 
 
+@pytest_asyncio.fixture(scope="module")
+async def client_exit_stack():
+    """Collects close() callbacks for the clients a module's tests build.
+
+    rpc_client and tests that need a non-default client (cache, pool size)
+    register close() here instead of awaiting it inline; the stack closes
+    them all when the module finishes.
+    """
+    async with AsyncExitStack() as stack:
+        yield stack
+
+
+@pytest_asyncio.fixture
+async def rpc_client(client_exit_stack):
+    """BitcoinRpcClient pointed at regtest default with dummy credentials.
+
+    A fresh instance per test, so no connection, cached read or chain name
+    leaks between tests; its close() runs with the module's exit stack.
+    """
+    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
+    client_exit_stack.push_async_callback(client.close)
+    return client
+
+
 @pytest.fixture
 def mock_rpc_client():
-    """BitcoinRpcClient with client.rpc replaced by an AsyncMock."""
+    """BitcoinRpcClient with client.rpc and client.rpc_batch replaced by AsyncMocks."""
     client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
     client.rpc = AsyncMock()
+    client.rpc_batch = AsyncMock()
     return client
+
+
+@pytest.fixture
+def stub_rpc(monkeypatch):
+    """Answer every request with a fixed JSON-RPC success, bypassing respx.
+
+    For tests that only need one canned result and never inspect the
+    request: ``stub_rpc(result)`` swaps the transport's request handler,
+    so no route matching or request capture happens.  Use respx_router
+    when a test asserts on URLs, bodies or call counts.
+    """
+
+    def _stub(result):
+        async def _handle(transport, request):
+            return rpc_success(result)
+
+        monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", _handle)
+
+    return _stub
+
+
+@pytest.fixture(scope="module")
+def _module_respx_router():
+    """One respx router patched into httpx for a whole test module."""
+    with respx.mock(assert_all_called=False) as router:
+        yield router
+
+
+@pytest.fixture
+def respx_router(_module_respx_router):
+    """The module's respx router, cleared of routes and calls after each test."""
+    yield _module_respx_router
+    _module_respx_router.clear()
+    _module_respx_router.reset()
@@ -4,128 +4,277 @@ Covers: lazy init, URL construction, JSON-RPC envelope, error handling,
 credential loading from cookie file and environment variables.
 """
 
-import json
+import logging
+import os
+from decimal import Decimal
 
 import httpx
+import orjson
 import pytest
-import respx
 from _helpers import RPC_URL, rpc_error, rpc_success
-from amplifier_module_tool_bitcoin_rpc.client import load_credentials
+from amplifier_module_tool_bitcoin_rpc.client import (
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_POOL_SIZE,
+    BitcoinRpcClient,
+    RPCCacheConfig,
+    load_cache_config,
+    load_credentials,
+    load_pool_size,
+)
 
 # ---------------------------------------------------------------------------
-# JSON-RPC envelope
+# JSON-RPC envelope and URL construction
 # ---------------------------------------------------------------------------
 
+# (method, wallet, result, expected POST URL)
+_ROUND_TRIP_CASES = [
+    ("getblockcount", "", 42, RPC_URL),
+    ("listunspent", "alice", [], f"{RPC_URL}/wallet/alice"),
+]
+
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_sends_correct_jsonrpc_envelope(rpc_client):
-    """rpc() must send {jsonrpc: '1.0', method, params: [], id} in the POST body."""
-    captured = {}
+@pytest.mark.parametrize(("method", "wallet", "result", "expected_url"), _ROUND_TRIP_CASES)
+async def test_rpc_round_trip(rpc_client, respx_router, method, wallet, result, expected_url):
+    """rpc() POSTs {jsonrpc: '1.0', id, method, params: []} to the wallet URL and returns result."""
+    route = respx_router.post(expected_url).mock(return_value=rpc_success(result))
 
-    def _capture(request):
-        captured.update(json.loads(request.content))
-        return rpc_success(42)
+    assert await rpc_client.rpc(method, wallet=wallet) == result
 
-    respx.post(RPC_URL).mock(side_effect=_capture)
+    assert route.called
+    body = orjson.loads(route.calls.last.request.content)
+    assert body["jsonrpc"] == "1.0"
+    assert body["method"] == method
+    assert body["params"] == []
+    assert "id" in body
 
-    result = await rpc_client.rpc("getblockcount")
-    await rpc_client.close()
 
-    assert captured["jsonrpc"] == "1.0"
-    assert captured["method"] == "getblockcount"
-    assert captured["params"] == []
-    assert "id" in captured
-    assert result == 42
+@pytest.mark.asyncio
+async def test_rpc_envelope_is_valid_json_with_params(rpc_client, respx_router):
+    """The spliced request body is exactly the JSON-RPC object, params included."""
+    route = respx_router.post(RPC_URL).mock(return_value=rpc_success("hash"))
+
+    await rpc_client.rpc("getblockhash", [0])
+
+    assert orjson.loads(route.calls.last.request.content) == {
+        "jsonrpc": "1.0",
+        "id": "amplifier_getblockhash",
+        "method": "getblockhash",
+        "params": [0],
+    }
+
+
+@pytest.mark.asyncio
+async def test_rpc_encodes_decimal_params_as_exact_numbers(rpc_client, respx_router):
+    """Decimal params are sent as JSON number literals with every digit intact."""
+    route = respx_router.post(RPC_URL).mock(return_value=rpc_success("txid"))
+
+    await rpc_client.rpc("sendtoaddress", ["bcrt1qdest", Decimal("21000000.00000001")])
+
+    assert b'"params":["bcrt1qdest",21000000.00000001]' in route.calls.last.request.content
 
 
 # ---------------------------------------------------------------------------
-# URL construction
+# Error handling
 # ---------------------------------------------------------------------------
 
+# (mocked outcome, expected exception, match)
+_ERROR_CASES = [
+    ({"return_value": rpc_error(-32601, "Method not found")}, RuntimeError, "RPC error"),
+    ({"return_value": httpx.Response(401, text="Unauthorized")}, httpx.HTTPStatusError, None),
+    ({"side_effect": httpx.ConnectError("refused")}, httpx.ConnectError, None),
+]
+
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_with_wallet_constructs_correct_url(rpc_client):
-    """rpc(wallet='alice') must POST to /wallet/alice."""
-    route = respx.post(f"{RPC_URL}/wallet/alice").mock(return_value=rpc_success([]))
+@pytest.mark.parametrize(
+    ("outcome", "expected", "match"),
+    _ERROR_CASES,
+    ids=["rpc-error", "http-401", "connect-error"],
+)
+async def test_rpc_raises(rpc_client, respx_router, outcome, expected, match):
+    """JSON-RPC errors raise RuntimeError; HTTP and transport errors propagate from httpx."""
+    respx_router.post(RPC_URL).mock(**outcome)
 
-    await rpc_client.rpc("listunspent", wallet="alice")
-    await rpc_client.close()
+    with pytest.raises(expected, match=match):
+        await rpc_client.rpc("getblockcount")
 
-    assert route.called
+
+# ---------------------------------------------------------------------------
+# Batched requests
+# ---------------------------------------------------------------------------
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_without_wallet_uses_base_url(rpc_client):
-    """rpc() without wallet must POST to the base URL and return the result."""
-    route = respx.post(RPC_URL).mock(return_value=rpc_success(100))
+async def test_rpc_batch_sends_one_post_and_orders_results(rpc_client, respx_router):
+    """rpc_batch() must POST a JSON array once and return results in call order."""
+    captured = []
 
-    result = await rpc_client.rpc("getblockcount")
-    await rpc_client.close()
+    def _capture(request):
+        captured.append(orjson.loads(request.content))
+        # Bitcoin Core may answer in any order; results are matched by id.
+        return httpx.Response(
+            200,
+            json=[
+                {"id": "amplifier_1_getnewaddress", "result": "bcrt1qsecond", "error": None},
+                {"id": "amplifier_0_getnewaddress", "result": "bcrt1qfirst", "error": None},
+            ],
+        )
+
+    route = respx_router.post(f"{RPC_URL}/wallet/alice").mock(side_effect=_capture)
+
+    result = await rpc_client.rpc_batch([("getnewaddress", [])] * 2, wallet="alice")
+
+    assert route.call_count == 1
+    assert [entry["method"] for entry in captured[0]] == ["getnewaddress", "getnewaddress"]
+    assert result == ["bcrt1qfirst", "bcrt1qsecond"]
 
-    assert route.called
-    assert result == 100
+
+@pytest.mark.asyncio
+async def test_rpc_batch_raises_runtime_error_on_entry_error(rpc_client, respx_router):
+    """An error in any batched entry must raise RuntimeError."""
+    respx_router.post(RPC_URL).mock(
+        return_value=httpx.Response(
+            200,
+            json=[
+                {
+                    "id": "amplifier_0_getnewaddress",
+                    "result": None,
+                    "error": {"code": -12, "message": "Keypool ran out"},
+                },
+            ],
+        )
+    )
+
+    with pytest.raises(RuntimeError, match="Keypool ran out"):
+        await rpc_client.rpc_batch([("getnewaddress", [])])
+
+
+@pytest.mark.asyncio
+async def test_rpc_batch_raises_runtime_error_on_whole_batch_error(rpc_client, respx_router):
+    """A single error object in place of the batch array surfaces as RuntimeError."""
+    respx_router.post(RPC_URL).mock(return_value=rpc_error(-32600, "Invalid Request"))
+
+    with pytest.raises(RuntimeError, match="Invalid Request"):
+        await rpc_client.rpc_batch([("getblockcount", [])])
 
 
 # ---------------------------------------------------------------------------
-# Error handling
+# Lazy client creation & close
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_raises_runtime_error_on_rpc_error(rpc_client):
-    """A JSON-RPC-level error must raise RuntimeError."""
-    respx.post(RPC_URL).mock(return_value=rpc_error(-32601, "Method not found"))
+async def test_write_generation_bumps_only_on_wallet_writes(rpc_client, respx_router):
+    """Spending RPCs bump write_generation; read-only RPCs leave it alone."""
+    route = respx_router.post(RPC_URL).mock(return_value=rpc_success("ok"))
+
+    await rpc_client.rpc("getblockcount")
+    assert rpc_client.write_generation == 0
+
+    await rpc_client.rpc("sendtoaddress", ["bcrt1qdest", "0.001"])
+    assert rpc_client.write_generation == 1
 
-    try:
-        with pytest.raises(RuntimeError, match="RPC error"):
-            await rpc_client.rpc("bad")
-    finally:
-        await rpc_client.close()
+    route.mock(
+        return_value=httpx.Response(
+            200,
+            json=[
+                {"id": "amplifier_0_getbalance", "result": 1.0, "error": None},
+                {"id": "amplifier_1_lockunspent", "result": True, "error": None},
+            ],
+        )
+    )
+    await rpc_client.rpc_batch([("getbalance", []), ("lockunspent", [True])])
+    assert rpc_client.write_generation == 2
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_raises_on_http_error(rpc_client):
-    """HTTP 401 must raise httpx.HTTPStatusError."""
-    respx.post(RPC_URL).mock(return_value=httpx.Response(401, text="Unauthorized"))
+async def test_read_only_rpc_served_from_cache(rpc_client, respx_router):
+    """A repeated read-only call within the TTL does not reach the node."""
+    route = respx_router.post(RPC_URL).mock(return_value=rpc_success(["wallet1"]))
 
-    try:
-        with pytest.raises(httpx.HTTPStatusError):
-            await rpc_client.rpc("getblockcount")
-    finally:
-        await rpc_client.close()
+    first = await rpc_client.rpc("listwallets")
+    first.append("mutated")
+    second = await rpc_client.rpc("listwallets")
+
+    assert second == ["wallet1"]
+    assert route.call_count == 1
 
 
 @pytest.mark.asyncio
-async def test_rpc_raises_on_connection_error(rpc_client):
-    """A connection failure must raise httpx.ConnectError."""
-    with respx.mock:
-        respx.post(RPC_URL).mock(side_effect=httpx.ConnectError("refused"))
+async def test_wallet_write_clears_read_cache(rpc_client, respx_router):
+    """A wallet write through the client forces the next read to the node."""
+    route = respx_router.post(RPC_URL).mock(return_value=rpc_success([]))
 
-        with pytest.raises(httpx.ConnectError):
-            await rpc_client.rpc("getblockcount")
-    await rpc_client.close()
+    await rpc_client.rpc("listunspent")
+    await rpc_client.rpc("sendtoaddress", ["bcrt1qdest", "0.001"])
+    await rpc_client.rpc("listunspent")
 
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cache",
+    [RPCCacheConfig(enabled=False), RPCCacheConfig(ttl=0)],
+    ids=["disabled", "zero-ttl"],
+)
+async def test_disabled_cache_sends_every_read(respx_router, client_exit_stack, cache):
+    """A disabled cache, or a zero TTL, sends every read-only call to the node."""
+    route = respx_router.post(RPC_URL).mock(return_value=rpc_success([]))
+    client = BitcoinRpcClient(RPC_URL, "u", "p", cache=cache)
+    client_exit_stack.push_async_callback(client.close)
+
+    await client.rpc("listunspent")
+    await client.rpc("listunspent")
+
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_cache_evicts_oldest_entry_at_size(respx_router, client_exit_stack):
+    """A full cache drops its oldest entry rather than growing past ``size``."""
+    route = respx_router.post(RPC_URL).mock(return_value=rpc_success("hash"))
+    client = BitcoinRpcClient(RPC_URL, "u", "p", cache=RPCCacheConfig(size=2))
+    client_exit_stack.push_async_callback(client.close)
+
+    for height in (1, 2, 3):
+        await client.rpc("getblockhash", [height])
+    await client.rpc("getblockhash", [3])  # still cached
+    await client.rpc("getblockhash", [1])  # evicted by height 3
+
+    assert route.call_count == 4
 
-# ---------------------------------------------------------------------------
-# Lazy client creation & close
-# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_batch_and_unlisted_methods_bypass_read_cache(rpc_client, respx_router):
+    """Batches and methods outside the read-only allowlist always reach the node."""
+    route = respx_router.post(RPC_URL).mock(return_value=rpc_success("tip"))
+
+    await rpc_client.rpc("getbestblockhash")
+    await rpc_client.rpc("getbestblockhash")
+    assert route.call_count == 2
+
+    route.mock(
+        return_value=httpx.Response(
+            200, json=[{"id": "amplifier_0_getblockcount", "result": 7, "error": None}]
+        )
+    )
+    await rpc_client.rpc_batch([("getblockcount", [])])
+    await rpc_client.rpc_batch([("getblockcount", [])])
+    assert route.call_count == 4
 
 
-def test_lazy_client_creation(rpc_client):
+def test_lazy_client_creation():
     """The internal httpx client must be None until the first request."""
-    assert rpc_client._client is None
+    client = BitcoinRpcClient(RPC_URL, "u", "p")
+    assert client._client is None
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_close_closes_client(rpc_client):
+async def test_close_closes_client(rpc_client, respx_router):
     """After close(), the internal _client must be None."""
-    respx.post(RPC_URL).mock(return_value=rpc_success(None))
+    respx_router.post(RPC_URL).mock(return_value=rpc_success(None))
 
     # Force client creation
     await rpc_client.rpc("ping")
@@ -135,6 +284,31 @@ async def test_close_closes_client(rpc_client):
     assert rpc_client._client is None
 
 
+@pytest.mark.asyncio
+async def test_rpc_reuses_one_http_client(rpc_client, respx_router):
+    """Successive rpc() and rpc_batch() calls share one pooled httpx client."""
+    respx_router.post(RPC_URL).mock(return_value=rpc_success(None))
+
+    await rpc_client.rpc("getblockcount")
+    first = rpc_client._client
+    await rpc_client.rpc("getnewaddress")
+    await rpc_client.rpc_batch([])
+
+    assert rpc_client._client is first
+
+
+@pytest.mark.asyncio
+async def test_pool_size_sets_keepalive_limits(client_exit_stack):
+    """pool_size bounds keep-alive connections; retries stay disabled."""
+    client = BitcoinRpcClient(RPC_URL, "u", "p", pool_size=4)
+    client_exit_stack.push_async_callback(client.close)
+    pool = client._ensure_client()._transport._pool  # type: ignore[attr-defined]
+
+    assert pool._max_keepalive_connections == 4
+    assert pool._max_connections == 8
+    assert pool._retries == 0
+
+
 # ---------------------------------------------------------------------------
 # Credential loading
 # ---------------------------------------------------------------------------
@@ -151,57 +325,136 @@ def test_load_credentials_from_cookie_file(tmp_path):
     assert password == "s3cret_t0ken"
 
 
+def test_load_credentials_reads_long_cookie_in_full(tmp_path):
+    """A cookie longer than the usual ~80 bytes is not truncated."""
+    cookie = tmp_path / ".cookie"
+    secret = "x" * 400
+    cookie.write_text(f"__cookie__:{secret}")
+
+    assert load_credentials({"cookie_file": str(cookie)}) == ("__cookie__", secret)
+
+
+def test_load_credentials_reuses_unchanged_cookie(tmp_path, monkeypatch):
+    """An unchanged cookie file is served from cache without reopening it."""
+    cookie = tmp_path / ".cookie"
+    cookie.write_text("__cookie__:cached")
+    assert load_credentials({"cookie_file": str(cookie)}) == ("__cookie__", "cached")
+
+    def _no_open(*args, **kwargs):
+        raise AssertionError("cookie file reopened despite unchanged stat")
+
+    monkeypatch.setattr(os, "open", _no_open)
+    assert load_credentials({"cookie_file": str(cookie)}) == ("__cookie__", "cached")
+
+
+def test_load_credentials_rereads_rewritten_cookie(tmp_path):
+    """A rewritten cookie file (node restart) yields the new credentials."""
+    cookie = tmp_path / ".cookie"
+    cookie.write_text("__cookie__:first")
+    assert load_credentials({"cookie_file": str(cookie)}) == ("__cookie__", "first")
+
+    cookie.write_text("__cookie__:second")
+    os.utime(cookie, ns=(0, cookie.stat().st_mtime_ns + 1_000_000_000))
+    assert load_credentials({"cookie_file": str(cookie)}) == ("__cookie__", "second")
+
+
 def test_load_credentials_file_not_found_raises_valueerror():
     """A missing cookie file must raise ValueError."""
     with pytest.raises(ValueError, match="Cookie file not found"):
         load_credentials({"cookie_file": "/no/such/.cookie"})
 
 
-def test_load_credentials_from_env_vars(monkeypatch):
+def test_load_credentials_from_env_vars():
     """load_credentials falls back to BITCOIN_RPC_USER / BITCOIN_RPC_PASSWORD."""
-    monkeypatch.setenv("BITCOIN_RPC_USER", "envuser")
-    monkeypatch.setenv("BITCOIN_RPC_PASSWORD", "envpass")
-
-    user, password = load_credentials({})
+    user, password = load_credentials(
+        {}, env={"BITCOIN_RPC_USER": "envuser", "BITCOIN_RPC_PASSWORD": "envpass"}
+    )
 
     assert user == "envuser"
     assert password == "envpass"
 
 
+def test_load_credentials_reads_cookie_path_from_env(tmp_path):
+    """BITCOIN_COOKIE_FILE is looked up in the supplied env mapping."""
+    cookie = tmp_path / ".cookie"
+    cookie.write_text("__cookie__:envcookie")
+
+    user, password = load_credentials({}, env={"BITCOIN_COOKIE_FILE": str(cookie)})
+
+    assert (user, password) == ("__cookie__", "envcookie")
+
+
+def test_load_cache_config_from_env():
+    """Cache TTL and size come from env vars; a TTL of 0 disables the cache."""
+    cache = load_cache_config(
+        {}, env={"BITCOIN_RPC_CACHE_TTL": "0", "BITCOIN_RPC_CACHE_SIZE": "16"}
+    )
+
+    assert cache == RPCCacheConfig(enabled=False, ttl=0.0, size=16)
+
+
+def test_load_cache_config_keeps_explicit_zero_size():
+    """An explicit rpc_cache_size of 0 is kept (and disables the cache), not replaced."""
+    cache = load_cache_config({"rpc_cache_size": 0}, env={"BITCOIN_RPC_CACHE_SIZE": "16"})
+
+    assert cache.size == 0
+    assert not cache.enabled
+
+
+@pytest.mark.parametrize("unset", [None, ""])
+def test_numeric_settings_treat_empty_config_as_unset(unset):
+    """A None or empty config value falls back to the env var, then the default."""
+    env = {"BITCOIN_RPC_CACHE_TTL": "5"}
+    cache = load_cache_config({"rpc_cache_ttl": unset, "rpc_cache_size": unset}, env=env)
+
+    assert cache == RPCCacheConfig(enabled=True, ttl=5.0, size=DEFAULT_CACHE_SIZE)
+    assert load_pool_size({"rpc_pool_size": unset}, env={}) == DEFAULT_POOL_SIZE
+
+
+@pytest.mark.parametrize(
+    ("loader", "env_var"),
+    [
+        (load_cache_config, "BITCOIN_RPC_CACHE_TTL"),
+        (load_cache_config, "BITCOIN_RPC_CACHE_SIZE"),
+        (load_pool_size, "BITCOIN_RPC_POOL_SIZE"),
+    ],
+)
+def test_numeric_settings_reject_unparseable_values(loader, env_var):
+    """A malformed numeric env var raises ValueError naming the setting."""
+    with pytest.raises(ValueError, match=env_var):
+        loader({}, env={env_var: "lots"})
+
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-@respx.mock
-async def test_rpc_logs_request(caplog):
-    """rpc() must emit a DEBUG log containing the method name."""
-    import logging
+def _client_log_messages(caplog) -> list[str]:
+    """Rendered messages from the client logger only, skipping httpx/respx noise."""
+    return [
+        record.getMessage()
+        for record in caplog.records
+        if record.name.startswith("amplifier_module_tool_bitcoin_rpc")
+    ]
 
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
 
-    respx.post(RPC_URL).mock(return_value=rpc_success("ok"))
-    client = BitcoinRpcClient(url=RPC_URL, user="u", password="p")
+@pytest.mark.asyncio
+async def test_rpc_logs_request(caplog, rpc_client, respx_router):
+    """rpc() must emit a DEBUG log containing the method name."""
+    respx_router.post(RPC_URL).mock(return_value=rpc_success("ok"))
     with caplog.at_level(logging.DEBUG):
-        await client.rpc("getblockcount")
-    assert "getblockcount" in caplog.text
-    await client.close()
+        await rpc_client.rpc("getblockcount")
+    assert any("getblockcount" in msg for msg in _client_log_messages(caplog))
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_does_not_log_param_values(caplog):
+async def test_rpc_does_not_log_param_values(caplog, rpc_client, respx_router):
     """rpc() must NOT log raw param values (defense in depth for sensitive args)."""
-    import logging
-
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
-    respx.post(RPC_URL).mock(return_value=rpc_success("ok"))
-    client = BitcoinRpcClient(url=RPC_URL, user="u", password="p")
+    respx_router.post(RPC_URL).mock(return_value=rpc_success("ok"))
     secret = "5HueCGU8rMjxEXxiPuD5BDku4MkFqeZyd4dZ1jvhTVqvbTLvyTJ"
     with caplog.at_level(logging.DEBUG):
-        await client.rpc("importprivkey", params=[secret])
-    assert "importprivkey" in caplog.text
-    assert secret not in caplog.text
-    await client.close()
+        await rpc_client.rpc("importprivkey", params=[secret])
+    messages = _client_log_messages(caplog)
+    assert any("importprivkey" in msg for msg in messages)
+    assert not any(secret in msg for msg in messages)
@@ -10,11 +10,11 @@ Verifies that:
 """
 
 import asyncio
-import json
+import re
 
 import httpx
+import orjson
 import pytest
-import respx
 from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
 from amplifier_module_tool_bitcoin_rpc.tools import ConsolidateUtxosTool
 
@@ -69,35 +69,49 @@ UTXO = {
 }
 
 
+# The mock only needs the method name to pick a reply, so it is pulled
+# straight from the request bytes instead of parsing the whole body.
+_METHOD_RE = re.compile(rb'"method"\s*:\s*"([^"]+)"')
+
+# Reply bodies are serialized once; each request gets a fresh Response
+# around the cached bytes because httpx.Response objects are single-use.
+_BODIES = {
+    method: orjson.dumps(_mock_rpc_response(method, result))
+    for method, result in {
+        "listunspent": [UTXO],
+        "getnewaddress": "bcrt1qnewaddr",
+        "sendall": {"txid": "bb" * 32},
+    }.items()
+}
+_NULL_BODY = orjson.dumps(_mock_rpc_response("unknown", None))
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+@pytest.fixture
+def consolidate_tool(rpc_client):
+    """ConsolidateUtxosTool over the test's rpc_client."""
+    return ConsolidateUtxosTool(rpc_client)
+
+
+@pytest.mark.slow
 @pytest.mark.asyncio
-async def test_concurrent_calls_use_correct_wallet_url():
+async def test_concurrent_calls_use_correct_wallet_url(consolidate_tool, respx_router):
     """Two concurrent execute() calls with different wallets must hit different URLs."""
     captured_urls: list[str] = []
 
     async def _capture_url(request: httpx.Request) -> httpx.Response:
         captured_urls.append(str(request.url))
-        body = json.loads(request.content)
-        method = body["method"]
-        if method == "listunspent":
-            return httpx.Response(200, json=_mock_rpc_response(method, [UTXO]))
-        elif method == "getnewaddress":
-            return httpx.Response(200, json=_mock_rpc_response(method, "bcrt1qnewaddr"))
-        elif method == "sendall":
-            return httpx.Response(200, json=_mock_rpc_response(method, {"txid": "bb" * 32}))
-        return httpx.Response(200, json=_mock_rpc_response(method, None))
-
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = ConsolidateUtxosTool(client)
-
-    with respx.mock(assert_all_mocked=False) as router:
-        router.route().mock(side_effect=_capture_url)
+        match = _METHOD_RE.search(request.content)
+        assert match is not None, request.content
+        method = match.group(1).decode()
+        return httpx.Response(200, content=_BODIES.get(method, _NULL_BODY), headers=_JSON_HEADERS)
 
-        result_a, result_b = await asyncio.gather(
-            tool.execute({"wallet": "wallet_a"}),
-            tool.execute({"wallet": "wallet_b"}),
-        )
+    respx_router.route().mock(side_effect=_capture_url)
 
-    await client.close()
+    result_a, result_b = await asyncio.gather(
+        consolidate_tool.execute({"wallet": "wallet_a"}),
+        consolidate_tool.execute({"wallet": "wallet_b"}),
+    )
 
     assert result_a.success, f"wallet_a call failed: {result_a}"
     assert result_b.success, f"wallet_b call failed: {result_b}"
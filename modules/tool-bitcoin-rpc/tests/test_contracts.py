@@ -1,36 +1,53 @@
 """Contract tests for the Bitcoin Core JSON-RPC wire format.
 
-These tests verify the *shape* of the requests that BitcoinRpcClient sends
-over the wire, using respx to intercept and inspect the POST bodies.
-They protect against accidental changes to the JSON-RPC envelope or the
+These tests verify the *shape* of the requests the tools send over the
+wire. Each one drives a real tool through respx and decodes the body it
+actually posted, so a change to a tool's call layout fails here. They
+protect against accidental changes to the JSON-RPC envelope or the
 parameter layout expected by Bitcoin Core.
 """
 
 import json
+from decimal import Decimal
 
 import httpx
 import pytest
-import respx
-from _helpers import RPC_URL
+from _helpers import RPC_URL, rpc_success
+from amplifier_module_tool_bitcoin_rpc.tools import ListUtxosTool, MineBlocksTool, SendCoinsTool
 
+# Canned result per method, enough for each tool to finish successfully.
+_RESULTS = {
+    "getblockchaininfo": {"chain": "regtest"},
+    "generatetoaddress": ["blockhash1"],
+    "getblockcount": 101,
+    "listunspent": [],
+    "sendtoaddress": "txid123",
+}
 
-def _capture_and_respond(captured: dict):
-    """Return a respx side_effect that stores the request body and responds OK."""
+
+@pytest.fixture
+def capture():
+    """A list of posted bodies and a respx side_effect that fills it and replies OK.
+
+    Bodies are decoded with ``parse_float=Decimal`` so BTC amounts keep the
+    exact literal the tool sent.
+    """
+    bodies: list = []
 
     def _handler(request):
-        captured.update(json.loads(request.content))
-        method = captured.get("method", "unknown")
-        return httpx.Response(
-            200,
-            json={
-                "jsonrpc": "1.0",
-                "id": f"amplifier_{method}",
-                "result": "ok",
-                "error": None,
-            },
-        )
+        body = json.loads(request.content, parse_float=Decimal)
+        bodies.append(body)
+        if isinstance(body, list):
+            return httpx.Response(
+                200,
+                json=[
+                    {"id": call["id"], "result": _RESULTS[call["method"]], "error": None}
+                    for call in body
+                ],
+            )
+        return rpc_success(_RESULTS.get(body["method"], "ok"))
 
-    return _handler
+    return bodies, _handler
 
 
 # ---------------------------------------------------------------------------
@@ -39,16 +56,15 @@ def _capture_and_respond(captured: dict):
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_jsonrpc_envelope_has_exactly_four_keys(rpc_client):
+async def test_jsonrpc_envelope_has_exactly_four_keys(rpc_client, respx_router, capture):
     """The POST body must contain exactly {jsonrpc, id, method, params}."""
-    captured: dict = {}
-    respx.post(RPC_URL).mock(side_effect=_capture_and_respond(captured))
+    bodies, handler = capture
+    respx_router.post(RPC_URL).mock(side_effect=handler)
 
     await rpc_client.rpc("getblockcount")
-    await rpc_client.close()
 
-    assert set(captured.keys()) == {"jsonrpc", "id", "method", "params"}
+    (body,) = bodies
+    assert set(body.keys()) == {"jsonrpc", "id", "method", "params"}
 
 
 # ---------------------------------------------------------------------------
@@ -57,20 +73,17 @@ async def test_jsonrpc_envelope_has_exactly_four_keys(rpc_client):
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_listunspent_params_shape(rpc_client):
-    """listunspent must send params=[min_conf] (a single-element list)."""
-    captured: dict = {}
-    respx.post(RPC_URL).mock(side_effect=_capture_and_respond(captured))
+async def test_listunspent_params_shape(rpc_client, respx_router, capture):
+    """list_utxos sends listunspent [minconf, maxconf, addresses, include_unsafe, query_options]."""
+    bodies, handler = capture
+    respx_router.post(RPC_URL).mock(side_effect=handler)
 
-    await rpc_client.rpc("listunspent", params=[0])
-    await rpc_client.close()
+    result = await ListUtxosTool(rpc_client).execute({})
 
-    assert captured["method"] == "listunspent"
-    assert captured["params"] == [0]
-    assert isinstance(captured["params"], list)
-    assert len(captured["params"]) == 1
-    assert isinstance(captured["params"][0], int)
+    assert result.success
+    (body,) = bodies
+    assert body["method"] == "listunspent"
+    assert body["params"] == [0, 9_999_999, [], True, {}]
 
 
 # ---------------------------------------------------------------------------
@@ -79,19 +92,19 @@ async def test_listunspent_params_shape(rpc_client):
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_generatetoaddress_params_shape(rpc_client):
-    """generatetoaddress must send params=[count, address]."""
-    captured: dict = {}
-    respx.post(RPC_URL).mock(side_effect=_capture_and_respond(captured))
+async def test_generatetoaddress_params_shape(rpc_client, respx_router, capture):
+    """mine_blocks sends generatetoaddress [count, address], batched with getblockcount."""
+    bodies, handler = capture
+    respx_router.post(RPC_URL).mock(side_effect=handler)
 
-    await rpc_client.rpc("generatetoaddress", params=[101, "bcrt1qminer"])
-    await rpc_client.close()
+    result = await MineBlocksTool(rpc_client).execute({"num_blocks": 1, "address": "bcrt1qminer"})
 
-    assert captured["method"] == "generatetoaddress"
-    assert captured["params"] == [101, "bcrt1qminer"]
-    assert isinstance(captured["params"][0], int)
-    assert isinstance(captured["params"][1], str)
+    assert result.success
+    batch = bodies[-1]
+    assert [(call["method"], call["params"]) for call in batch] == [
+        ("generatetoaddress", [1, "bcrt1qminer"]),
+        ("getblockcount", []),
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -100,23 +113,37 @@ async def test_generatetoaddress_params_shape(rpc_client):
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_sendtoaddress_params_shape(rpc_client):
-    """sendtoaddress must send params=[address, amount, comment, '', subtract_fee].
+async def test_sendtoaddress_params_shape(rpc_client, respx_router, capture):
+    """send_coins sends sendtoaddress [address, amount, comment, '', subtract_fee].
 
-    address is str, amount is float, subtract_fee is bool.
+    address is str, amount is an exact 8-decimal BTC number (a Decimal on
+    our side, never a float), subtract_fee is bool.
     """
-    captured: dict = {}
-    respx.post(RPC_URL).mock(side_effect=_capture_and_respond(captured))
+    bodies, handler = capture
+    respx_router.post(RPC_URL).mock(side_effect=handler)
 
-    await rpc_client.rpc(
-        "sendtoaddress",
-        params=["bcrt1qdest", 0.001, "", "", True],
+    result = await SendCoinsTool(rpc_client).execute(
+        {"address": "bcrt1qdest", "amount_sats": 100_000, "subtract_fee_from_amount": True}
     )
-    await rpc_client.close()
 
-    assert captured["method"] == "sendtoaddress"
-    params = captured["params"]
-    assert isinstance(params[0], str)  # address
-    assert isinstance(params[1], float)  # amount in BTC
-    assert isinstance(params[4], bool)  # subtract_fee_from_amount
+    assert result.success
+    (body,) = bodies
+    assert body["method"] == "sendtoaddress"
+    assert body["params"] == ["bcrt1qdest", Decimal("0.00100000"), "", "", True]
+    assert str(body["params"][1]) == "0.00100000"
+
+
+# ---------------------------------------------------------------------------
+# 5. Content-Type header
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_request_declares_json_content_type(rpc_client, respx_router, capture):
+    """The POST must carry Content-Type: application/json (body is pre-encoded bytes)."""
+    _, handler = capture
+    route = respx_router.post(RPC_URL).mock(side_effect=handler)
+
+    await rpc_client.rpc("getblockcount")
+
+    assert route.calls.last.request.headers["content-type"] == "application/json"
@@ -1,47 +1,43 @@
 """Tests for load_credentials resource leak fix.
 
 Verifies that:
-1. The function uses a context manager (with statement) for file I/O.
+1. The function closes the cookie file descriptor in a ``finally`` block.
 2. FileNotFoundError is caught and raised as ValueError with actionable message.
 3. PermissionError is caught and raised as ValueError with actionable message.
-4. The source file parses cleanly with ast.parse.
 """
 
 import ast
-import pathlib
-import tempfile
 
 import pytest
 from amplifier_module_tool_bitcoin_rpc.client import load_credentials
 
-SRC_PATH = pathlib.Path(__file__).resolve().parents[1] / (
-    "amplifier_module_tool_bitcoin_rpc/client.py"
-)
-
-
 # ---------------------------------------------------------------------------
 # Structural / AST tests
 # ---------------------------------------------------------------------------
 
 
-def test_source_parses_cleanly():
-    """The source file must parse without errors."""
-    source = SRC_PATH.read_text()
-    tree = ast.parse(source)  # Raises SyntaxError if broken
-    assert tree is not None
-
+def test_load_credentials_closes_fd_in_finally(client_tree):
+    """load_credentials must close the cookie fd in `finally`, not leak it via bare open()."""
+    _, tree = client_tree
 
-def test_load_credentials_uses_context_manager():
-    """load_credentials must use a `with` statement for file I/O, not bare open()."""
-    source = SRC_PATH.read_text()
-    tree = ast.parse(source)
-
-    for node in ast.walk(tree):
+    for node in tree.body:
         if isinstance(node, ast.FunctionDef) and node.name == "load_credentials":
-            # Check there is at least one `with` statement
-            has_with = any(isinstance(stmt, ast.With) for stmt in ast.walk(node))
-            assert has_with, (
-                "load_credentials must use a `with` statement (context manager) for file I/O"
+            # Check that os.close(fd) runs in a finally block
+            closes_in_finally = any(
+                isinstance(stmt, ast.Try)
+                and any(
+                    isinstance(call, ast.Call)
+                    and isinstance(call.func, ast.Attribute)
+                    and isinstance(call.func.value, ast.Name)
+                    and call.func.value.id == "os"
+                    and call.func.attr == "close"
+                    for final in stmt.finalbody
+                    for call in ast.walk(final)
+                )
+                for stmt in ast.walk(node)
+            )
+            assert closes_in_finally, (
+                "load_credentials must call os.close() in a `finally` block for file I/O"
             )
 
             # Check there is no bare open().read() pattern (Expr -> Call -> Attribute.read)
@@ -79,40 +75,21 @@ def test_file_not_found_raises_value_error():
     assert "BITCOIN_COOKIE_FILE" in str(exc_info.value)
 
 
-def test_permission_denied_raises_value_error():
+def test_permission_denied_raises_value_error(unreadable_cookie):
     """Unreadable cookie file must raise ValueError mentioning file permissions."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".cookie", delete=False) as tmp:
-        tmp.write("user:pass")
-        tmp_path = tmp.name
-
-    p = pathlib.Path(tmp_path)
-    try:
-        p.chmod(0o000)
-        config = {"cookie_file": tmp_path}
-        with pytest.raises(ValueError, match="Permission denied") as exc_info:
-            load_credentials(config)
-        assert "file permissions" in str(exc_info.value)
-    finally:
-        p.chmod(0o644)
-        p.unlink()
+    config = {"cookie_file": str(unreadable_cookie)}
+    with pytest.raises(ValueError, match="Permission denied") as exc_info:
+        load_credentials(config)
+    assert "file permissions" in str(exc_info.value)
 
 
 # ---------------------------------------------------------------------------
-# Happy-path test (context manager should still work for valid files)
+# Happy-path test
 # ---------------------------------------------------------------------------
 
 
-def test_valid_cookie_file_returns_credentials():
+def test_valid_cookie_file_returns_credentials(valid_cookie):
     """A valid cookie file should return (user, password) tuple."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".cookie", delete=False) as tmp:
-        tmp.write("__cookie__:abc123secret")
-        tmp_path = tmp.name
-
-    p = pathlib.Path(tmp_path)
-    try:
-        config = {"cookie_file": tmp_path}
-        user, password = load_credentials(config)
-        assert user == "__cookie__"
-        assert password == "abc123secret"
-    finally:
-        p.unlink()
+    user, password = load_credentials({"cookie_file": str(valid_cookie)})
+    assert user == "__cookie__"
+    assert password == "abc123secret"
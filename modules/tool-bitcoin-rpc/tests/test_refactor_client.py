@@ -1,63 +1,39 @@
 """Tests for BitcoinRpcClient and load_credentials in client.py.
 
 Verifies:
-1. client.py parses cleanly with ast.parse
-2. BitcoinRpcClient has lazy httpx init, rpc() method, close() method, url property
-3. rpc() constructs proper JSON-RPC envelope with amplifier_ prefix
-4. rpc() constructs wallet URL when wallet param provided
-5. rpc() raises RuntimeError on JSON-RPC error
-6. rpc() raises httpx.HTTPStatusError on HTTP error
-7. load_credentials() uses context manager for file I/O
+1. BitcoinRpcClient has lazy httpx init, rpc() method, close() method, url property
+2. rpc() constructs proper JSON-RPC envelope with amplifier_ prefix
+3. rpc() constructs wallet URL when wallet param provided
+4. rpc() raises RuntimeError on JSON-RPC error
+5. rpc() raises httpx.HTTPStatusError on HTTP 500 and 401
+6. load_credentials() uses context manager for file I/O
 """
 
 import ast
-import json
-import pathlib
-import tempfile
 
 import httpx
+import orjson
 import pytest
-import respx
-
-CLIENT_SRC = pathlib.Path(__file__).resolve().parents[1] / (
-    "amplifier_module_tool_bitcoin_rpc/client.py"
-)
-
-RPC_URL = "http://localhost:18443"
-RPC_USER = "testuser"
-RPC_PASS = "testpass"
-
+from _helpers import RPC_PASS, RPC_URL, RPC_USER, rpc_error, rpc_success
+from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient, load_credentials
 
 # ---------------------------------------------------------------------------
 # Structural tests
 # ---------------------------------------------------------------------------
 
 
-def test_client_module_parses_cleanly():
-    """client.py must parse without errors."""
-    source = CLIENT_SRC.read_text()
-    tree = ast.parse(source)
-    assert tree is not None
-
-
 def test_client_class_exists():
     """BitcoinRpcClient class must exist in client.py."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     assert BitcoinRpcClient is not None
 
 
 def test_load_credentials_exists():
     """load_credentials function must exist in client.py."""
-    from amplifier_module_tool_bitcoin_rpc.client import load_credentials
-
     assert callable(load_credentials)
 
 
 def test_client_has_required_interface():
     """BitcoinRpcClient must have rpc(), close() methods and url property."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
     assert hasattr(client, "rpc")
     assert callable(client.rpc)
@@ -69,16 +45,12 @@ def test_client_has_required_interface():
 
 def test_client_url_property():
     """url property returns the base URL."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
     assert client.url == RPC_URL
 
 
 def test_client_lazy_init():
     """httpx.AsyncClient should not be created until first use."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
     assert client._client is None
 
@@ -89,34 +61,21 @@ def test_client_lazy_init():
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_constructs_jsonrpc_envelope():
+async def test_rpc_constructs_jsonrpc_envelope(rpc_client, respx_router):
     """rpc() must send proper JSON-RPC 1.0 envelope with amplifier_ id prefix."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     captured_request: httpx.Request | None = None
 
     def capture(request):
         nonlocal captured_request
         captured_request = request
-        return httpx.Response(
-            200,
-            json={
-                "jsonrpc": "1.0",
-                "id": "amplifier_getblockcount",
-                "result": 100,
-                "error": None,
-            },
-        )
-
-    respx.post(RPC_URL).mock(side_effect=capture)
+        return rpc_success(100)
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    result = await client.rpc("getblockcount")
-    await client.close()
+    respx_router.post(RPC_URL).mock(side_effect=capture)
+
+    result = await rpc_client.rpc("getblockcount")
 
     assert captured_request is not None
-    body = json.loads(captured_request.content)
+    body = orjson.loads(captured_request.content)
     assert body["jsonrpc"] == "1.0"
     assert body["id"] == "amplifier_getblockcount"
     assert body["method"] == "getblockcount"
@@ -125,155 +84,83 @@ async def test_rpc_constructs_jsonrpc_envelope():
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_passes_params():
+async def test_rpc_passes_params(rpc_client, respx_router):
     """rpc() must pass params to JSON-RPC envelope."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     captured_request: httpx.Request | None = None
 
     def capture(request):
         nonlocal captured_request
         captured_request = request
-        return httpx.Response(
-            200,
-            json={
-                "jsonrpc": "1.0",
-                "id": "amplifier_listunspent",
-                "result": [],
-                "error": None,
-            },
-        )
-
-    respx.post(RPC_URL).mock(side_effect=capture)
+        return rpc_success([])
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    await client.rpc("listunspent", params=[1])
-    await client.close()
+    respx_router.post(RPC_URL).mock(side_effect=capture)
+
+    await rpc_client.rpc("listunspent", params=[1])
 
     assert captured_request is not None
-    body = json.loads(captured_request.content)
+    body = orjson.loads(captured_request.content)
     assert body["params"] == [1]
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_with_wallet_url():
+async def test_rpc_with_wallet_url(rpc_client, respx_router):
     """rpc() with wallet param constructs wallet URL."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     captured_url: str | None = None
 
     def capture(request):
         nonlocal captured_url
         captured_url = str(request.url)
-        return httpx.Response(
-            200,
-            json={
-                "jsonrpc": "1.0",
-                "id": "amplifier_listunspent",
-                "result": [],
-                "error": None,
-            },
-        )
-
-    respx.post(f"{RPC_URL}/wallet/testwallet").mock(side_effect=capture)
+        return rpc_success([])
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    await client.rpc("listunspent", wallet="testwallet")
-    await client.close()
+    respx_router.post(f"{RPC_URL}/wallet/testwallet").mock(side_effect=capture)
+
+    await rpc_client.rpc("listunspent", wallet="testwallet")
 
     assert captured_url is not None
     assert "wallet/testwallet" in captured_url
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_raises_runtime_error_on_jsonrpc_error():
+async def test_rpc_raises_runtime_error_on_jsonrpc_error(rpc_client, respx_router):
     """rpc() must raise RuntimeError when JSON-RPC response has error."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
-    respx.post(RPC_URL).mock(
-        return_value=httpx.Response(
-            200,
-            json={
-                "jsonrpc": "1.0",
-                "id": "amplifier_bad",
-                "result": None,
-                "error": {"code": -1, "message": "bad"},
-            },
-        )
-    )
+    respx_router.post(RPC_URL).mock(return_value=rpc_error(-1, "bad"))
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
     with pytest.raises(RuntimeError):
-        await client.rpc("bad")
-    await client.close()
+        await rpc_client.rpc("bad")
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_raises_http_status_error_on_500():
-    """rpc() must raise HTTPStatusError on HTTP 500."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
-    respx.post(RPC_URL).mock(return_value=httpx.Response(500, text="Internal Server Error"))
-
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    with pytest.raises(httpx.HTTPStatusError):
-        await client.rpc("getblockcount")
-    await client.close()
-
-
-@pytest.mark.asyncio
-@respx.mock
-async def test_rpc_raises_http_status_error_on_401():
-    """rpc() must raise HTTPStatusError on HTTP 401."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
-    respx.post(RPC_URL).mock(return_value=httpx.Response(401, text="Unauthorized"))
+@pytest.mark.parametrize(
+    ("status", "body"), [(500, "Internal Server Error"), (401, "Unauthorized")]
+)
+async def test_rpc_raises_http_status_error(rpc_client, respx_router, status, body):
+    """rpc() must raise HTTPStatusError on HTTP 500 and 401."""
+    respx_router.post(RPC_URL).mock(return_value=httpx.Response(status, text=body))
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
     with pytest.raises(httpx.HTTPStatusError):
-        await client.rpc("getblockcount")
-    await client.close()
+        await rpc_client.rpc("getblockcount")
 
 
 @pytest.mark.asyncio
 async def test_close_without_requests():
     """close() without having made any requests should not error."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
     await client.close()  # Should not raise
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_client_uses_auth():
+async def test_client_uses_auth(rpc_client, respx_router):
     """Client must send basic auth with user/password."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     captured_request: httpx.Request | None = None
 
     def capture(request):
         nonlocal captured_request
         captured_request = request
-        return httpx.Response(
-            200,
-            json={
-                "jsonrpc": "1.0",
-                "id": "amplifier_test",
-                "result": None,
-                "error": None,
-            },
-        )
-
-    respx.post(RPC_URL).mock(side_effect=capture)
+        return rpc_success(None)
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    await client.rpc("test")
-    await client.close()
+    respx_router.post(RPC_URL).mock(side_effect=capture)
+
+    await rpc_client.rpc("test")
 
     # Check that Authorization header is present (basic auth)
     assert captured_request is not None
@@ -285,15 +172,24 @@ async def test_client_uses_auth():
 # ---------------------------------------------------------------------------
 
 
-def test_load_credentials_uses_context_manager():
-    """load_credentials must use a `with` statement for file I/O."""
-    source = CLIENT_SRC.read_text()
-    tree = ast.parse(source)
+def test_load_credentials_closes_cookie_fd_in_finally(client_tree):
+    """load_credentials must close the cookie file descriptor in a finally block."""
+    _, tree = client_tree
 
-    for node in ast.walk(tree):
+    for node in tree.body:
         if isinstance(node, ast.FunctionDef) and node.name == "load_credentials":
-            has_with = any(isinstance(stmt, ast.With) for stmt in ast.walk(node))
-            assert has_with, "load_credentials must use a `with` statement for file I/O"
+            closes_in_finally = any(
+                isinstance(stmt, ast.Try)
+                and any(
+                    isinstance(call, ast.Call)
+                    and isinstance(call.func, ast.Attribute)
+                    and call.func.attr == "close"
+                    for final in stmt.finalbody
+                    for call in ast.walk(final)
+                )
+                for stmt in ast.walk(node)
+            )
+            assert closes_in_finally, "load_credentials must close the cookie fd in `finally`"
             return
 
     pytest.fail("load_credentials function not found in client.py")
@@ -301,82 +197,43 @@ def test_load_credentials_uses_context_manager():
 
 def test_load_credentials_file_not_found():
     """Missing cookie file must raise ValueError."""
-    from amplifier_module_tool_bitcoin_rpc.client import load_credentials
-
     config = {"cookie_file": "/nonexistent/path/to/.cookie"}
     with pytest.raises(ValueError, match="Cookie file not found"):
         load_credentials(config)
 
 
-def test_load_credentials_permission_denied():
+def test_load_credentials_permission_denied(unreadable_cookie):
     """Unreadable cookie file must raise ValueError."""
-    from amplifier_module_tool_bitcoin_rpc.client import load_credentials
-
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".cookie", delete=False) as tmp:
-        tmp.write("user:pass")
-        tmp_path = tmp.name
-
-    p = pathlib.Path(tmp_path)
-    try:
-        p.chmod(0o000)
-        config = {"cookie_file": tmp_path}
-        with pytest.raises(ValueError, match="Permission denied"):
-            load_credentials(config)
-    finally:
-        p.chmod(0o644)
-        p.unlink()
+    with pytest.raises(ValueError, match="Permission denied"):
+        load_credentials({"cookie_file": str(unreadable_cookie)})
 
 
-def test_load_credentials_valid_cookie():
+def test_load_credentials_valid_cookie(valid_cookie):
     """A valid cookie file should return (user, password) tuple."""
-    from amplifier_module_tool_bitcoin_rpc.client import load_credentials
-
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".cookie", delete=False) as tmp:
-        tmp.write("__cookie__:abc123secret")
-        tmp_path = tmp.name
-
-    p = pathlib.Path(tmp_path)
-    try:
-        config = {"cookie_file": tmp_path}
-        user, password = load_credentials(config)
-        assert user == "__cookie__"
-        assert password == "abc123secret"
-    finally:
-        p.unlink()
+    user, password = load_credentials({"cookie_file": str(valid_cookie)})
+    assert user == "__cookie__"
+    assert password == "abc123secret"
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_rpc_empty_list_params_preserved():
+async def test_rpc_empty_list_params_preserved(rpc_client, respx_router):
     """rpc() with params=[] must send [] (not replace with a new []).
 
     Ensures the `params` handling uses identity check (`is None`) rather than
     truthiness, so an intentional empty list is not silently replaced.
     """
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-
     captured_request: httpx.Request | None = None
 
     def capture(request):
         nonlocal captured_request
         captured_request = request
-        return httpx.Response(
-            200,
-            json={
-                "jsonrpc": "1.0",
-                "id": "amplifier_test",
-                "result": None,
-                "error": None,
-            },
-        )
-
-    respx.post(RPC_URL).mock(side_effect=capture)
+        return rpc_success(None)
+
+    respx_router.post(RPC_URL).mock(side_effect=capture)
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
     explicit_empty: list = []
-    await client.rpc("test", params=explicit_empty)
-    await client.close()
+    await rpc_client.rpc("test", params=explicit_empty)
 
     assert captured_request is not None
-    body = json.loads(captured_request.content)
+    body = orjson.loads(captured_request.content)
     assert body["params"] == []
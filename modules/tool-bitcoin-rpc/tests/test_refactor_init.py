@@ -1,7 +1,7 @@
 """Tests for __init__.py thin mount wiring.
 
 Verifies:
-1. __init__.py parses cleanly with ast.parse
+1. __init__.py, tools.py and client.py parse cleanly
 2. __init__.py is thin (~25 lines, not 1000+)
 3. mount() function exists and returns a cleanup function
 4. __init__.py imports from .client and .tools
@@ -9,12 +9,35 @@ Verifies:
 """
 
 import ast
-import pathlib
 
 import pytest
+from amplifier_module_tool_bitcoin_rpc import mount
 
-INIT_SRC = pathlib.Path(__file__).resolve().parents[1] / (
-    "amplifier_module_tool_bitcoin_rpc/__init__.py"
+# Classes that belong in tools.py / client.py, never in __init__.py.
+_TOOL_CLASSES = frozenset(
+    {
+        "ListUtxosTool",
+        "SplitUtxosTool",
+        "ManageWalletTool",
+        "GenerateAddressTool",
+        "SendCoinsTool",
+        "ConsolidateUtxosTool",
+        "MineBlocksTool",
+        "BitcoinRpcClient",
+    }
+)
+
+# Names mount() registers with the coordinator.
+_EXPECTED_TOOL_NAMES = frozenset(
+    {
+        "list_utxos",
+        "split_utxos",
+        "manage_wallet",
+        "generate_address",
+        "send_coins",
+        "consolidate_utxos",
+        "mine_blocks",
+    }
 )
 
 
@@ -23,33 +46,32 @@ INIT_SRC = pathlib.Path(__file__).resolve().parents[1] / (
 # ---------------------------------------------------------------------------
 
 
-def test_init_parses_cleanly():
-    """__init__.py must parse without errors."""
-    source = INIT_SRC.read_text()
-    tree = ast.parse(source)
+@pytest.mark.parametrize("tree_fixture", ["init_tree", "tools_tree", "client_tree"])
+def test_package_sources_parse_cleanly(request, tree_fixture):
+    """__init__.py, tools.py and client.py must parse without errors."""
+    _, tree = request.getfixturevalue(tree_fixture)
     assert tree is not None
 
 
-def test_init_is_thin():
+def test_init_is_thin(init_tree):
     """__init__.py should be thin wiring (~25 lines), not the old monolith."""
-    source = INIT_SRC.read_text()
+    source, _ = init_tree
     lines = [line for line in source.strip().splitlines() if line.strip()]
     assert len(lines) < 60, f"__init__.py has {len(lines)} non-empty lines, should be thin (~25)"
 
 
-def test_init_has_mount_function():
+def test_init_has_mount_function(init_tree):
     """__init__.py must have a mount() function."""
-    source = INIT_SRC.read_text()
-    tree = ast.parse(source)
+    _, tree = init_tree
     func_names = {
         n.name for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
     }
     assert "mount" in func_names
 
 
-def test_init_imports_from_client_and_tools():
+def test_init_imports_from_client_and_tools(init_tree):
     """__init__.py must import from .client and .tools."""
-    source = INIT_SRC.read_text()
+    source, _ = init_tree
     has_client_import = (
         "from .client" in source or "from amplifier_module_tool_bitcoin_rpc.client" in source
     )
@@ -60,23 +82,12 @@ def test_init_imports_from_client_and_tools():
     assert has_tools_import, "__init__.py must import from .tools"
 
 
-def test_no_tool_classes_in_init():
+def test_no_tool_classes_in_init(init_tree):
     """__init__.py must not contain tool class definitions (they belong in tools.py)."""
-    source = INIT_SRC.read_text()
-    tree = ast.parse(source)
-    class_names = {n.name for n in ast.walk(tree) if isinstance(n, ast.ClassDef)}
-    tool_classes = {
-        "ListUtxosTool",
-        "SplitUtxosTool",
-        "ManageWalletTool",
-        "GenerateAddressTool",
-        "SendCoinsTool",
-        "ConsolidateUtxosTool",
-        "MineBlocksTool",
-        "BitcoinRpcClient",
-    }
-    overlap = class_names & tool_classes
-    assert not overlap, f"__init__.py should not define: {overlap}"
+    _, tree = init_tree
+    for node in tree.body:  # top-level only; mount() builds tools, it never defines them
+        if isinstance(node, ast.ClassDef) and node.name in _TOOL_CLASSES:
+            pytest.fail(f"__init__.py should not define: {node.name}")
 
 
 # ---------------------------------------------------------------------------
@@ -85,11 +96,8 @@ def test_no_tool_classes_in_init():
 
 
 @pytest.mark.asyncio
-async def test_mount_returns_cleanup_function():
+async def test_mount_returns_cleanup_function(monkeypatch):
     """mount() must return a cleanup callable."""
-    import os
-
-    from amplifier_module_tool_bitcoin_rpc import mount
 
     # Create a minimal coordinator mock
     class MockCoordinator:
@@ -101,57 +109,58 @@ async def test_mount_returns_cleanup_function():
 
     coordinator = MockCoordinator()
 
-    # Set required env vars
-    old_env = {}
-    env_vars = {
-        "BITCOIN_RPC_USER": "testuser",
-        "BITCOIN_RPC_PASSWORD": "testpass",
-        "BITCOIN_RPC_HOST": "127.0.0.1",
-        "BITCOIN_RPC_PORT": "18443",
-    }
-    for k, v in env_vars.items():
-        old_env[k] = os.environ.get(k)
-        os.environ[k] = v
-
-    try:
-        cleanup = await mount(coordinator, {})
-
-        # Must return a callable cleanup function
-        assert cleanup is not None
-        assert callable(cleanup)
-
-        # Must mount all 7 tools
-        assert len(coordinator.mounted) == 7
-
-        # Tool names must match expected
-        mounted_names = {name for _, name in coordinator.mounted}
-        expected_names = {
-            "list_utxos",
-            "split_utxos",
-            "manage_wallet",
-            "generate_address",
-            "send_coins",
-            "consolidate_utxos",
-            "mine_blocks",
-        }
-        assert mounted_names == expected_names
-
-        # All mounted as "tools" kind
-        assert all(kind == "tools" for kind, _ in coordinator.mounted)
-
-        # Cleanup should be awaitable or callable
-        import asyncio
-        import inspect
-
-        if inspect.iscoroutinefunction(cleanup):
-            await cleanup()
-        else:
-            result = cleanup()
-            if asyncio.iscoroutine(result):
-                await result
-    finally:
-        for k, v in old_env.items():
-            if v is None:
-                os.environ.pop(k, None)
-            else:
-                os.environ[k] = v
+    # Set required env vars; monkeypatch restores them after the test
+    monkeypatch.setenv("BITCOIN_RPC_USER", "testuser")
+    monkeypatch.setenv("BITCOIN_RPC_PASSWORD", "testpass")
+    monkeypatch.setenv("BITCOIN_RPC_HOST", "127.0.0.1")
+    monkeypatch.setenv("BITCOIN_RPC_PORT", "18443")
+
+    cleanup = await mount(coordinator, {})
+
+    # Must return a callable cleanup function
+    assert cleanup is not None
+    assert callable(cleanup)
+
+    # Must mount all 7 tools
+    assert len(coordinator.mounted) == 7
+
+    # Tool names must match expected
+    mounted_names = {name for _, name in coordinator.mounted}
+    assert mounted_names == _EXPECTED_TOOL_NAMES
+
+    # All mounted as "tools" kind
+    assert all(kind == "tools" for kind, _ in coordinator.mounted)
+
+    # Cleanup should be awaitable or callable
+    import asyncio
+    import inspect
+
+    if inspect.iscoroutinefunction(cleanup):
+        await cleanup()
+    else:
+        result = cleanup()
+        if asyncio.iscoroutine(result):
+            await result
+
+
+@pytest.mark.asyncio
+async def test_mount_reads_pool_size_from_env(monkeypatch):
+    """mount() must pass BITCOIN_RPC_POOL_SIZE through to the shared client."""
+
+    class MockCoordinator:
+        def __init__(self):
+            self.tools = []
+
+        async def mount(self, kind, tool, name=None):
+            self.tools.append(tool)
+
+    monkeypatch.setenv("BITCOIN_RPC_USER", "testuser")
+    monkeypatch.setenv("BITCOIN_RPC_PASSWORD", "testpass")
+    monkeypatch.delenv("BITCOIN_COOKIE_FILE", raising=False)
+    monkeypatch.setenv("BITCOIN_RPC_POOL_SIZE", "3")
+
+    coordinator = MockCoordinator()
+    cleanup = await mount(coordinator, {})
+
+    assert all(tool._client._pool_size == 3 for tool in coordinator.tools)
+    await cleanup()
@@ -1,122 +1,85 @@
 """Tests for tool classes in tools.py.
 
 Verifies:
-1. tools.py parses cleanly with ast.parse
-2. All 7 tool classes exist
-3. Each tool receives BitcoinRpcClient in __init__
-4. Each tool has correct name, description, input_schema, execute
-5. Tools delegate to client.rpc() and catch errors
+1. All 7 tools receive BitcoinRpcClient in __init__ and have the correct
+   name, description, input_schema and execute
+2. Tools delegate to client.rpc() and catch errors
 """
 
 import ast
-import pathlib
+import json
+from decimal import Decimal
 
 import httpx
+import orjson
 import pytest
-import respx
-
-TOOLS_SRC = pathlib.Path(__file__).resolve().parents[1] / (
-    "amplifier_module_tool_bitcoin_rpc/tools.py"
+from _helpers import RPC_URL, rpc_success
+from amplifier_module_tool_bitcoin_rpc.tools import (
+    ConsolidateUtxosTool,
+    GenerateAddressTool,
+    ListUtxosTool,
+    ManageWalletTool,
+    MineBlocksTool,
+    SendCoinsTool,
+    SplitUtxosTool,
+    _rpc_error_result,
 )
 
-RPC_URL = "http://localhost:18443"
-RPC_USER = "testuser"
-RPC_PASS = "testpass"
-
-
 # ---------------------------------------------------------------------------
 # Structural tests
 # ---------------------------------------------------------------------------
 
 
-def test_tools_module_parses_cleanly():
-    """tools.py must parse without errors."""
-    source = TOOLS_SRC.read_text()
-    tree = ast.parse(source)
-    assert tree is not None
+# (registered name, tool class) for all 7 tools
+_TOOL_SPECS = [
+    ("list_utxos", ListUtxosTool),
+    ("split_utxos", SplitUtxosTool),
+    ("manage_wallet", ManageWalletTool),
+    ("generate_address", GenerateAddressTool),
+    ("send_coins", SendCoinsTool),
+    ("consolidate_utxos", ConsolidateUtxosTool),
+    ("mine_blocks", MineBlocksTool),
+]
 
 
-def test_all_seven_tool_classes_exist():
-    """tools.py must contain all 7 tool classes."""
-    from amplifier_module_tool_bitcoin_rpc.tools import (
-        ConsolidateUtxosTool,
-        GenerateAddressTool,
-        ListUtxosTool,
-        ManageWalletTool,
-        MineBlocksTool,
-        SendCoinsTool,
-        SplitUtxosTool,
-    )
+@pytest.mark.parametrize(("name", "cls"), _TOOL_SPECS, ids=[name for name, _ in _TOOL_SPECS])
+def test_tool_contract(_module_rpc_client, name, cls):
+    """Each tool takes the shared client and exposes its name, schema and execute().
 
-    assert all(
-        [
-            ListUtxosTool,
-            SplitUtxosTool,
-            ManageWalletTool,
-            GenerateAddressTool,
-            SendCoinsTool,
-            ConsolidateUtxosTool,
-            MineBlocksTool,
-        ]
-    )
+    name, description and input_schema are class attributes, not rebuilt per access.
+    """
+    tool = cls(_module_rpc_client)
+    assert tool.name == name == cls.name
+    assert tool.description is cls.description
+    assert tool.input_schema is cls.input_schema
+    assert tool.input_schema is tool.input_schema
+    assert callable(tool.execute)
 
 
-def test_tools_receive_client_in_init():
-    """Each tool must accept BitcoinRpcClient in __init__."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import (
-        ConsolidateUtxosTool,
-        GenerateAddressTool,
-        ListUtxosTool,
-        ManageWalletTool,
-        MineBlocksTool,
-        SendCoinsTool,
-        SplitUtxosTool,
-    )
+def test_no_tool_keeps_its_own_transport(tools_tree):
+    """No tool may carry a private _rpc_call or raw RPC credentials.
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tools = [
-        ListUtxosTool(client),
-        SplitUtxosTool(client),
-        ManageWalletTool(client),
-        GenerateAddressTool(client),
-        SendCoinsTool(client),
-        ConsolidateUtxosTool(client),
-        MineBlocksTool(client),
-    ]
-    for tool in tools:
-        assert hasattr(tool, "name")
-        assert hasattr(tool, "description")
-        assert hasattr(tool, "input_schema")
-        assert hasattr(tool, "execute")
-
-
-def test_tool_names():
-    """Each tool must have the correct name property."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import (
-        ConsolidateUtxosTool,
-        GenerateAddressTool,
-        ListUtxosTool,
-        ManageWalletTool,
-        MineBlocksTool,
-        SendCoinsTool,
-        SplitUtxosTool,
-    )
+    Every tool must route through the shared BitcoinRpcClient so pooling,
+    batching and encoding changes reach all of them.
+    """
+    _, tree = tools_tree
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    expected = {
-        "list_utxos": ListUtxosTool,
-        "split_utxos": SplitUtxosTool,
-        "manage_wallet": ManageWalletTool,
-        "generate_address": GenerateAddressTool,
-        "send_coins": SendCoinsTool,
-        "consolidate_utxos": ConsolidateUtxosTool,
-        "mine_blocks": MineBlocksTool,
-    }
-    for name, cls in expected.items():
-        tool = cls(client)
-        assert tool.name == name
+    for cls in tree.body:
+        if not isinstance(cls, ast.ClassDef):
+            continue
+        methods = {
+            n.name for n in cls.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
+        }
+        assert "_rpc_call" not in methods, f"{cls.name} defines its own _rpc_call"
+        attrs = {
+            n.attr
+            for n in ast.walk(cls)
+            if isinstance(n, ast.Attribute)
+            and isinstance(n.value, ast.Name)
+            and n.value.id == "self"
+        }
+        leaked = attrs & {"_rpc_url", "_rpc_user", "_rpc_password", "_wallet_url"}
+        assert not leaked, f"{cls.name} holds raw RPC connection state: {sorted(leaked)}"
 
 
 # ---------------------------------------------------------------------------
@@ -124,42 +87,22 @@ def test_tool_names():
 # ---------------------------------------------------------------------------
 
 
-def _success_response(method, result):
-    return httpx.Response(
-        200,
-        json={
-            "jsonrpc": "1.0",
-            "id": f"amplifier_{method}",
-            "result": result,
-            "error": None,
-        },
-    )
-
-
 @pytest.mark.asyncio
-@respx.mock
-async def test_list_utxos_empty_wallet():
+async def test_list_utxos_empty_wallet(rpc_client, stub_rpc):
     """ListUtxosTool returns success with message for empty wallet."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import ListUtxosTool
 
-    respx.post(RPC_URL).mock(return_value=_success_response("listunspent", []))
+    stub_rpc([])
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = ListUtxosTool(client)
+    tool = ListUtxosTool(rpc_client)
     result = await tool.execute({})
-    await client.close()
 
     assert result.success
     assert "No UTXOs" in result.output
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_list_utxos_formats_table():
+async def test_list_utxos_formats_table(rpc_client, stub_rpc):
     """ListUtxosTool formats UTXOs as a table with sats/BTC/confs/outpoint."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import ListUtxosTool
 
     utxos = [
         {
@@ -170,12 +113,10 @@ async def test_list_utxos_formats_table():
             "address": "bcrt1qtest",
         }
     ]
-    respx.post(RPC_URL).mock(return_value=_success_response("listunspent", utxos))
+    stub_rpc(utxos)
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = ListUtxosTool(client)
+    tool = ListUtxosTool(rpc_client)
     result = await tool.execute({})
-    await client.close()
 
     assert result.success
     assert "100,000" in result.output  # 0.001 BTC = 100,000 sats
@@ -184,172 +125,167 @@ async def test_list_utxos_formats_table():
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_tool_catches_http_status_error():
+async def test_tool_catches_http_status_error(mock_rpc_client):
     """Tools must catch httpx.HTTPStatusError and return ToolResult with error."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import ListUtxosTool
 
-    respx.post(RPC_URL).mock(return_value=httpx.Response(500, text="Internal Server Error"))
+    request = httpx.Request("POST", RPC_URL)
+    mock_rpc_client.rpc.side_effect = httpx.HTTPStatusError(
+        "500",
+        request=request,
+        response=httpx.Response(500, text="Internal Server Error", request=request),
+    )
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = ListUtxosTool(client)
+    tool = ListUtxosTool(mock_rpc_client)
     result = await tool.execute({})
-    await client.close()
 
     assert not result.success
     assert result.error is not None
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_tool_catches_runtime_error():
+async def test_tool_catches_runtime_error(mock_rpc_client):
     """Tools must catch RuntimeError from client and return ToolResult with error."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import ListUtxosTool
 
-    respx.post(RPC_URL).mock(
-        return_value=httpx.Response(
-            200,
-            json={
-                "jsonrpc": "1.0",
-                "id": "amplifier_listunspent",
-                "result": None,
-                "error": {"code": -1, "message": "bad"},
-            },
-        )
-    )
+    mock_rpc_client.rpc.side_effect = RuntimeError("RPC error: {'code': -1, 'message': 'bad'}")
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = ListUtxosTool(client)
+    tool = ListUtxosTool(mock_rpc_client)
     result = await tool.execute({})
-    await client.close()
 
     assert not result.success
     assert result.error is not None
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_mine_blocks_warns_under_101():
+async def test_mine_blocks_warns_under_101(rpc_client, respx_router):
     """MineBlocksTool should warn when mining fewer than 101 blocks."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import MineBlocksTool
 
-    respx.post(RPC_URL).mock(return_value=_success_response("generatetoaddress", ["blockhash1"]))
+    def handler(request):
+        body = orjson.loads(request.content)
+        if isinstance(body, dict):
+            return rpc_success({"chain": "regtest", "blocks": 0})
+        # generatetoaddress + getblockcount arrive as one batch
+        results = {"generatetoaddress": ["blockhash1"], "getblockcount": 1}
+        return httpx.Response(
+            200,
+            json=[
+                {"id": call["id"], "result": results[call["method"]], "error": None}
+                for call in body
+            ],
+        )
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = MineBlocksTool(client)
+    respx_router.post(RPC_URL).mock(side_effect=handler)
+
+    tool = MineBlocksTool(rpc_client)
     result = await tool.execute({"num_blocks": 1, "address": "bcrt1qtest"})
-    await client.close()
 
     assert result.success
     assert "100 more" in result.output or "spendable" in result.output
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_generate_address_delegates():
+async def test_generate_address_delegates(rpc_client, stub_rpc):
     """GenerateAddressTool must delegate to client and return address."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import GenerateAddressTool
 
-    respx.post(RPC_URL).mock(return_value=_success_response("getnewaddress", "bcrt1qnewaddr"))
+    stub_rpc("bcrt1qnewaddr")
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = GenerateAddressTool(client)
+    tool = GenerateAddressTool(rpc_client)
     result = await tool.execute({})
-    await client.close()
 
     assert result.success
     assert "bcrt1qnewaddr" in result.output
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_send_coins_converts_sats_to_btc():
+async def test_send_coins_converts_sats_to_btc(rpc_client, respx_router):
     """SendCoinsTool must convert sats to BTC for the RPC call."""
-    import json
-
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import SendCoinsTool
-
     captured_body: dict | None = None
+    captured_raw = b""
 
     def capture(request):
-        nonlocal captured_body
-        captured_body = json.loads(request.content)
-        return _success_response("sendtoaddress", "txid123")
+        nonlocal captured_body, captured_raw
+        captured_raw = request.content
+        captured_body = json.loads(request.content, parse_float=Decimal)
+        return rpc_success("txid123")
 
-    respx.post(RPC_URL).mock(side_effect=capture)
+    respx_router.post(RPC_URL).mock(side_effect=capture)
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = SendCoinsTool(client)
+    tool = SendCoinsTool(rpc_client)
     result = await tool.execute({"address": "bcrt1qtest", "amount_sats": 100_000})
-    await client.close()
 
     assert result.success
-    # 100,000 sats = 0.001 BTC
+    # 100,000 sats = 0.001 BTC, sent as an exact 8-decimal number literal
     assert captured_body is not None
-    assert captured_body["params"][1] == 0.001
+    assert captured_body["params"][1] == Decimal("0.001")
+    assert b"0.00100000" in captured_raw
 
 
 @pytest.mark.asyncio
-@respx.mock
-async def test_manage_wallet_list():
+async def test_manage_wallet_list(rpc_client, respx_router):
     """ManageWalletTool list action returns wallets."""
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import ManageWalletTool
 
-    call_count = 0
-
-    def handler(request):
-        nonlocal call_count
-        import json
-
-        body = json.loads(request.content)
-        call_count += 1
-        if body["method"] == "listwallets":
-            return _success_response("listwallets", ["wallet1"])
-        elif body["method"] == "listwalletdir":
-            return _success_response("listwalletdir", {"wallets": [{"name": "wallet1"}]})
-        return _success_response(body["method"], None)
-
-    respx.post(RPC_URL).mock(side_effect=handler)
+    # Both list calls arrive as one JSON-RPC batch; ids are positional, so
+    # the reply is fixed and the mock never has to parse the request.
+    batch_reply = httpx.Response(
+        200,
+        json=[
+            {"id": "amplifier_0_listwallets", "result": ["wallet1"], "error": None},
+            {
+                "id": "amplifier_1_listwalletdir",
+                "result": {"wallets": [{"name": "wallet1"}]},
+                "error": None,
+            },
+        ],
+    )
+    route = respx_router.post(RPC_URL).mock(return_value=batch_reply)
 
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = ManageWalletTool(client)
+    tool = ManageWalletTool(rpc_client)
     result = await tool.execute({"action": "list"})
-    await client.close()
 
     assert result.success
     assert "wallet1" in result.output
+    assert route.call_count == 1
 
 
 @pytest.mark.asyncio
-async def test_manage_wallet_unknown_action_returns_error():
+async def test_manage_wallet_unknown_action_returns_error(rpc_client):
     """ManageWalletTool must return an error ToolResult for unknown actions.
 
     Even though schema validation makes this unreachable in practice,
     defensive coding requires an explicit error rather than implicit None.
     """
-    from amplifier_module_tool_bitcoin_rpc.client import BitcoinRpcClient
-    from amplifier_module_tool_bitcoin_rpc.tools import ManageWalletTool
-
-    client = BitcoinRpcClient(RPC_URL, RPC_USER, RPC_PASS)
-    tool = ManageWalletTool(client)
+    tool = ManageWalletTool(rpc_client)
     # Bypass schema validation — call execute directly with an invalid action
     result = await tool.execute({"action": "invalid_action", "wallet": "test"})
-    await client.close()
 
     assert result is not None, "execute() must not return None for unknown actions"
     assert not result.success
     assert "Unknown action" in result.error["message"]
 
 
-def test_tools_use_error_helper():
+def test_tools_use_error_helper(tools_tree):
     """tools.py should use a shared _rpc_error_result helper to reduce boilerplate."""
-    source = TOOLS_SRC.read_text()
+    source, _ = tools_tree
     assert "_rpc_error_result" in source, (
         "tools.py should define a _rpc_error_result helper to reduce error-handling boilerplate"
     )
+
+
+def test_rpc_error_result_maps_httpx_subclasses():
+    """Concrete httpx errors map like their base class; other errors use str()."""
+
+    request = httpx.Request("POST", RPC_URL)
+    response = httpx.Response(401, text="Unauthorized", request=request)
+
+    status = _rpc_error_result(httpx.HTTPStatusError("401", request=request, response=response))
+    assert status.error["message"] == "RPC HTTP error 401: Unauthorized"
+
+    for _ in range(2):  # second pass hits the per-type entry cached by the first
+        result = _rpc_error_result(httpx.ConnectError("refused", request=request))
+        assert result.error["message"] == "Could not reach Bitcoin node: refused"
+
+    timeout = _rpc_error_result(httpx.ReadTimeout("timed out", request=request))
+    assert timeout.error["message"] == "Could not reach Bitcoin node: timed out"
+
+    rpc = _rpc_error_result(RuntimeError("RPC error: {'code': -4}"))
+    assert not rpc.success
+    assert rpc.error["message"] == "RPC error: {'code': -4}"
@@ -4,6 +4,9 @@ Every test uses ``mock_rpc_client`` (AsyncMock on ``client.rpc``) so no
 network traffic is generated.  Each scenario follows Given/When/Then.
 """
 
+import asyncio
+from decimal import Decimal
+
 import pytest
 from amplifier_module_tool_bitcoin_rpc.tools import (
     ConsolidateUtxosTool,
@@ -15,6 +18,28 @@ from amplifier_module_tool_bitcoin_rpc.tools import (
     SplitUtxosTool,
 )
 
+
+def _rpc_by_method(responses):
+    """Return an ``rpc`` side_effect that answers by method name.
+
+    Tools that issue calls concurrently or conditionally would otherwise
+    depend on the exact order of a positional side_effect list.
+    """
+
+    def _dispatch(method, params=None, wallet=""):
+        return responses[method]
+
+    return _dispatch
+
+
+def _rpc_params(mock_rpc_client, method):
+    """Return the params of the first ``rpc`` call made for ``method``."""
+    for call in mock_rpc_client.rpc.call_args_list:
+        if call.args[0] == method:
+            return call.kwargs["params"]
+    raise AssertionError(f"{method} was never called")
+
+
 # ---------------------------------------------------------------------------
 # ListUtxosTool
 # ---------------------------------------------------------------------------
@@ -42,6 +67,152 @@ async def test_list_utxos_formatted_table_with_sats(mock_rpc_client):
     assert "0.00100000" in result.output
 
 
+@pytest.mark.asyncio
+async def test_list_utxos_total_has_no_float_drift(mock_rpc_client):
+    """Summing many 0.1 BTC UTXOs must yield an exact sat total."""
+    mock_rpc_client.rpc.return_value = [
+        {"txid": f"{i:064x}", "vout": 0, "amount": 0.1, "confirmations": 1, "address": "a"}
+        for i in range(10)
+    ]
+
+    tool = ListUtxosTool(mock_rpc_client)
+    result = await tool.execute({})
+
+    assert "100,000,000 sats (1.00000000 BTC) total" in result.output
+
+
+@pytest.mark.asyncio
+async def test_list_utxos_rows_sorted_by_address(mock_rpc_client):
+    """Given several UTXOs, rows are numbered in address order under one header."""
+    mock_rpc_client.rpc.return_value = [
+        {"txid": "bb" * 32, "vout": 1, "amount": 0.0002, "confirmations": 1, "address": "bcrt1qz"},
+        {"txid": "aa" * 32, "vout": 0, "amount": 0.0001, "confirmations": 3, "address": "bcrt1qa"},
+    ]
+
+    tool = ListUtxosTool(mock_rpc_client)
+    result = await tool.execute({})
+
+    lines = result.output.splitlines()
+    assert lines[0].startswith("Found 2 UTXO(s)")
+    assert "30,000 sats" in lines[0]
+    assert lines[-2] == "| 1 | bcrt1qa | 10,000 | 0.00010000 | 3 | aaaaaaaa..aaaa:0 |"
+    assert lines[-1] == "| 2 | bcrt1qz | 20,000 | 0.00020000 | 1 | bbbbbbbb..bbbb:1 |"
+
+
+@pytest.mark.asyncio
+async def test_list_utxos_missing_address_sorts_first_as_unknown(mock_rpc_client):
+    """Given a UTXO without an address, it sorts first and renders as 'unknown'."""
+    mock_rpc_client.rpc.return_value = [
+        {"txid": "bb" * 32, "vout": 1, "amount": 0.0002, "confirmations": 1, "address": "bcrt1qz"},
+        {"txid": "aa" * 32, "vout": 0, "amount": 0.0001, "confirmations": 3},
+    ]
+
+    tool = ListUtxosTool(mock_rpc_client)
+    result = await tool.execute({})
+
+    lines = result.output.splitlines()
+    assert lines[-2] == "| 1 | unknown | 10,000 | 0.00010000 | 3 | aaaaaaaa..aaaa:0 |"
+    assert lines[-1] == "| 2 | bcrt1qz | 20,000 | 0.00020000 | 1 | bbbbbbbb..bbbb:1 |"
+
+
+@pytest.mark.asyncio
+async def test_list_utxos_pushes_filters_to_listunspent(mock_rpc_client):
+    """Given filters, they are passed to listunspent rather than applied locally."""
+    mock_rpc_client.rpc.return_value = []
+
+    tool = ListUtxosTool(mock_rpc_client)
+    await tool.execute(
+        {
+            "min_confirmations": 1,
+            "max_confirmations": 100,
+            "addresses": ["bcrt1qa"],
+            "min_amount_sats": 10_000,
+            "max_count": 5,
+        }
+    )
+
+    params = mock_rpc_client.rpc.call_args.kwargs["params"]
+    assert params == [
+        1,
+        100,
+        ["bcrt1qa"],
+        True,
+        {"minimumAmount": Decimal("0.00010000"), "maximumCount": 5},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_utxos_can_exclude_unsafe(mock_rpc_client):
+    """Given include_unsafe false, listunspent is told to skip unsafe coins."""
+    mock_rpc_client.rpc.return_value = []
+
+    tool = ListUtxosTool(mock_rpc_client)
+    await tool.execute({"include_unsafe": False})
+
+    params = mock_rpc_client.rpc.call_args.kwargs["params"]
+    assert params == [0, 9_999_999, [], False, {}]
+
+
+@pytest.mark.asyncio
+async def test_list_utxos_default_listunspent_params(mock_rpc_client):
+    """Without filters, listunspent gets Bitcoin Core's defaults for the extra arguments."""
+    mock_rpc_client.rpc.return_value = []
+
+    tool = ListUtxosTool(mock_rpc_client)
+    await tool.execute({})
+
+    params = mock_rpc_client.rpc.call_args.kwargs["params"]
+    assert params == [0, 9_999_999, [], True, {}]
+
+
+@pytest.mark.asyncio
+async def test_list_utxos_caps_rows_at_max_rows(mock_rpc_client):
+    """Given more UTXOs than max_rows, the largest are listed and the rest summarized."""
+    mock_rpc_client.rpc.return_value = [
+        {"txid": "aa" * 32, "vout": 0, "amount": 0.0001, "confirmations": 1, "address": "bcrt1qa"},
+        {"txid": "bb" * 32, "vout": 1, "amount": 0.0005, "confirmations": 1, "address": "bcrt1qb"},
+        {"txid": "cc" * 32, "vout": 2, "amount": 0.0002, "confirmations": 1, "address": "bcrt1qc"},
+        {"txid": "dd" * 32, "vout": 3, "amount": 0.0003, "confirmations": 1, "address": "bcrt1qd"},
+    ]
+
+    tool = ListUtxosTool(mock_rpc_client)
+    result = await tool.execute({"max_rows": 2})
+
+    lines = result.output.splitlines()
+    assert lines[0].startswith("Found 4 UTXO(s)")
+    assert "110,000 sats" in lines[0]
+    rows = [line for line in lines if line.startswith("| ") and "bcrt1q" in line]
+    assert rows == [
+        "| 1 | bcrt1qb | 50,000 | 0.00050000 | 1 | bbbbbbbb..bbbb:1 |",
+        "| 2 | bcrt1qd | 30,000 | 0.00030000 | 1 | dddddddd..dddd:3 |",
+    ]
+    assert "and 2 more UTXO(s) totaling 30,000 sats" in lines[-1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_rows", [None, 0, -1, "10"])
+async def test_list_utxos_rejects_invalid_max_rows(mock_rpc_client, max_rows):
+    """Given a non-positive or non-integer max_rows, return an error without calling the node."""
+    tool = ListUtxosTool(mock_rpc_client)
+    result = await tool.execute({"max_rows": max_rows})
+
+    assert not result.success
+    assert "max_rows" in result.error["message"]
+    mock_rpc_client.rpc.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_list_utxos_confirmed_goes_straight_to_listunspent(mock_rpc_client):
+    """Given min_confirmations 1, listunspent is the only call; no tip lookup first."""
+    mock_rpc_client.rpc.return_value = []
+
+    tool = ListUtxosTool(mock_rpc_client)
+    await tool.execute({"min_confirmations": 1})
+    await tool.execute({"min_confirmations": 1})
+
+    assert [c.args[0] for c in mock_rpc_client.rpc.call_args_list] == ["listunspent"] * 2
+
+
 @pytest.mark.asyncio
 async def test_list_utxos_empty_list(mock_rpc_client):
     """Given no UTXOs, the output says 'No UTXOs found'."""
@@ -71,16 +242,21 @@ async def test_list_utxos_rpc_error(mock_rpc_client):
 # ---------------------------------------------------------------------------
 
 
+_SPLIT_PIPELINE = {
+    "getwalletinfo": {"balance": 1.0},
+    "getnewaddress": "bcrt1qgenerated",
+    "createrawtransaction": "raw_hex_aabb",
+    "fundrawtransaction": {"hex": "funded_hex_ccdd"},
+    "signrawtransactionwithwallet": {"hex": "signed_hex_eeff"},
+    "sendrawtransaction": "txid_final_1234",
+    "send": {"complete": True, "txid": "txid_send_5678"},
+}
+
+
 @pytest.mark.asyncio
 async def test_split_utxos_raw_tx_pipeline(mock_rpc_client):
-    """Given valid outputs, the tool runs 5 RPC calls and returns txid."""
-    mock_rpc_client.rpc.side_effect = [
-        "bcrt1qgenerated",  # getnewaddress
-        "raw_hex_aabb",  # createrawtransaction
-        {"hex": "funded_hex_ccdd"},  # fundrawtransaction
-        {"hex": "signed_hex_eeff"},  # signrawtransactionwithwallet
-        "txid_final_1234",  # sendrawtransaction
-    ]
+    """Given a repeated destination, the tool uses the raw tx pipeline and returns txid."""
+    mock_rpc_client.rpc.side_effect = _rpc_by_method(_SPLIT_PIPELINE)
 
     tool = SplitUtxosTool(mock_rpc_client)
     result = await tool.execute(
@@ -92,7 +268,136 @@ async def test_split_utxos_raw_tx_pipeline(mock_rpc_client):
 
     assert result.success
     assert "txid_final_1234" in result.output
-    assert mock_rpc_client.rpc.call_count == 5
+    assert mock_rpc_client.rpc.call_count == 6
+    assert "send" not in [call.args[0] for call in mock_rpc_client.rpc.call_args_list]
+    assert _rpc_params(mock_rpc_client, "createrawtransaction")[1] == [
+        {"bcrt1qgenerated": Decimal("0.00050000")},
+        {"bcrt1qgenerated": Decimal("0.00050000")},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_split_utxos_amounts_are_exact_btc_decimals(mock_rpc_client):
+    """Sats are sent as exact 8-decimal BTC Decimals, never rounded floats."""
+    mock_rpc_client.rpc.side_effect = _rpc_by_method(
+        {**_SPLIT_PIPELINE, "getwalletinfo": {"balance": 21_000_001.0}}
+    )
+
+    tool = SplitUtxosTool(mock_rpc_client)
+    result = await tool.execute(
+        {
+            "outputs": [{"amount_sats": 2_100_000_000_000_001, "count": 1}],
+            "address": "bcrt1qdest",
+        }
+    )
+
+    assert result.success
+    outputs = _rpc_params(mock_rpc_client, "send")[0]
+    assert outputs == [{"bcrt1qdest": Decimal("21000000.00000001")}]
+    assert "2,100,000,000,000,001 sats" in result.output
+
+
+@pytest.mark.asyncio
+async def test_split_utxos_fresh_address_batches_getnewaddress(mock_rpc_client):
+    """Given fresh_address, one batched call yields a distinct address per output."""
+    mock_rpc_client.rpc_batch.return_value = ["bcrt1qone", "bcrt1qtwo", "bcrt1qthree"]
+    mock_rpc_client.rpc.side_effect = _rpc_by_method(_SPLIT_PIPELINE)
+
+    tool = SplitUtxosTool(mock_rpc_client)
+    result = await tool.execute(
+        {
+            "outputs": [{"amount_sats": 50_000, "count": 2}, {"amount_sats": 10_000, "count": 1}],
+            "fresh_address": True,
+            "wallet": "alice",
+        }
+    )
+
+    assert result.success
+    mock_rpc_client.rpc_batch.assert_awaited_once_with([("getnewaddress", [])] * 3, wallet="alice")
+    outputs = _rpc_params(mock_rpc_client, "send")[0]
+    assert outputs == [
+        {"bcrt1qone": Decimal("0.00050000")},
+        {"bcrt1qtwo": Decimal("0.00050000")},
+        {"bcrt1qthree": Decimal("0.00010000")},
+    ]
+    assert "txid_send_5678" in result.output
+    assert "createrawtransaction" not in [c.args[0] for c in mock_rpc_client.rpc.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_split_utxos_insufficient_balance_fails_before_building_tx(mock_rpc_client):
+    """Given outputs exceeding the wallet balance, fail without building a transaction."""
+    mock_rpc_client.rpc.side_effect = _rpc_by_method(
+        {**_SPLIT_PIPELINE, "getwalletinfo": {"balance": 0.001}}
+    )
+
+    tool = SplitUtxosTool(mock_rpc_client)
+    result = await tool.execute(
+        {"outputs": [{"amount_sats": 60_000, "count": 2}], "address": "bcrt1qdest"}
+    )
+
+    assert not result.success
+    assert "Insufficient funds" in result.error["message"]
+    assert "120,000 sats" in result.error["message"]
+    assert "100,000 sats" in result.error["message"]
+    called = [call.args[0] for call in mock_rpc_client.rpc.call_args_list]
+    assert called == ["getwalletinfo"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("spec", [{}, {"fresh_address": True}], ids=["default", "fresh"])
+async def test_split_utxos_insufficient_balance_takes_no_address(mock_rpc_client, spec):
+    """Given a rejected split, no address is drawn from the wallet's keypool."""
+    mock_rpc_client.rpc.side_effect = _rpc_by_method(
+        {**_SPLIT_PIPELINE, "getwalletinfo": {"balance": 0.0001}}
+    )
+
+    tool = SplitUtxosTool(mock_rpc_client)
+    result = await tool.execute({"outputs": [{"amount_sats": 50_000, "count": 2}], **spec})
+
+    assert not result.success
+    called = [call.args[0] for call in mock_rpc_client.rpc.call_args_list]
+    assert called == ["getwalletinfo"]
+
+
+@pytest.mark.asyncio
+async def test_split_utxos_reuses_pregenerated_default_address(mock_rpc_client):
+    """After the first split, the default destination comes from the refilled pool."""
+    mock_rpc_client.rpc.side_effect = _rpc_by_method(_SPLIT_PIPELINE)
+    mock_rpc_client.rpc_batch.return_value = ["bcrt1qpool1", "bcrt1qpool2", "bcrt1qpool3"]
+
+    tool = SplitUtxosTool(mock_rpc_client)
+    await tool.execute({"outputs": [{"amount_sats": 50_000, "count": 1}], "wallet": "alice"})
+    await asyncio.sleep(0)  # let the background refill run
+    mock_rpc_client.rpc.reset_mock()
+    result = await tool.execute(
+        {"outputs": [{"amount_sats": 50_000, "count": 1}], "wallet": "alice"}
+    )
+    await tool.close()
+
+    assert result.success
+    assert "bcrt1qpool1" in result.output
+    mock_rpc_client.rpc_batch.assert_awaited_with([("getnewaddress", [])] * 4, wallet="alice")
+    called = [call.args[0] for call in mock_rpc_client.rpc.call_args_list]
+    assert "getnewaddress" not in called
+
+
+@pytest.mark.asyncio
+async def test_split_utxos_fresh_address_conflicts_with_address(mock_rpc_client):
+    """Given both address and fresh_address, return an error without any RPC."""
+    tool = SplitUtxosTool(mock_rpc_client)
+    result = await tool.execute(
+        {
+            "outputs": [{"amount_sats": 50_000, "count": 2}],
+            "address": "bcrt1qdest",
+            "fresh_address": True,
+        }
+    )
+
+    assert not result.success
+    assert "cannot be used together" in result.error["message"]
+    mock_rpc_client.rpc.assert_not_called()
+    mock_rpc_client.rpc_batch.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -113,18 +418,34 @@ async def test_split_utxos_empty_outputs_error(mock_rpc_client):
 @pytest.mark.asyncio
 async def test_manage_wallet_list_action(mock_rpc_client):
     """Given action=list, the tool lists wallets on disk with loaded tags."""
-    mock_rpc_client.rpc.side_effect = [
-        ["alice"],  # listwallets
-        {"wallets": [{"name": "alice"}, {"name": "bob"}]},  # listwalletdir
+    mock_rpc_client.rpc_batch.return_value = [
+        ["alice"],
+        {"wallets": [{"name": "alice"}, {"name": "bob"}]},
     ]
 
     tool = ManageWalletTool(mock_rpc_client)
     result = await tool.execute({"action": "list"})
 
     assert result.success
-    assert "alice" in result.output
-    assert "(loaded)" in result.output
-    assert "bob" in result.output
+    mock_rpc_client.rpc_batch.assert_awaited_once_with([("listwallets", []), ("listwalletdir", [])])
+    mock_rpc_client.rpc.assert_not_awaited()
+    assert '"alice" (loaded)' in result.output
+    assert '"bob"' in result.output
+    assert '"bob" (loaded)' not in result.output
+
+
+@pytest.mark.asyncio
+async def test_manage_wallet_list_batch_error(mock_rpc_client):
+    """An error from either batched list call is returned as a failed result."""
+    mock_rpc_client.rpc_batch.side_effect = RuntimeError(
+        "RPC error: {'code': -18, 'message': 'Wallet directory not found'}"
+    )
+
+    tool = ManageWalletTool(mock_rpc_client)
+    result = await tool.execute({"action": "list"})
+
+    assert not result.success
+    assert "Wallet directory not found" in result.error["message"]
 
 
 @pytest.mark.asyncio
@@ -200,10 +521,10 @@ async def test_send_coins_converts_sats_to_btc(mock_rpc_client):
     assert result.success
     assert "txid_send_5678" in result.output
 
-    # Verify BTC amount passed: 100_000 sats = 0.001 BTC
+    # Verify BTC amount passed: 100_000 sats = 0.001 BTC, as an exact Decimal
     # The tool calls rpc("sendtoaddress", params=[...], wallet=...)
     params = mock_rpc_client.rpc.call_args.kwargs["params"]
-    assert params[1] == 0.001
+    assert params[1] == Decimal("0.00100000")
 
 
 @pytest.mark.asyncio
@@ -259,6 +580,119 @@ async def test_consolidate_utxos_outpoint_filter_selects_subset(mock_rpc_client)
     assert inputs[0]["txid"] == txid_a
 
 
+@pytest.mark.asyncio
+async def test_consolidate_utxos_reports_missing_outpoints(mock_rpc_client):
+    """Given an outpoint absent from listunspent, fail and name it without spending."""
+    txid_a = "aa" * 32
+    mock_rpc_client.rpc.side_effect = [
+        [{"txid": txid_a, "vout": 0, "amount": 0.01, "confirmations": 10}],
+    ]
+
+    tool = ConsolidateUtxosTool(mock_rpc_client)
+    result = await tool.execute({"outpoints": [f"{txid_a}:0", f"{'cc' * 32}:7"]})
+
+    assert not result.success
+    assert f"{'cc' * 32}:7" in result.error["message"]
+    assert f"{txid_a}:0" not in result.error["message"]
+    assert "sendall" not in [c.args[0] for c in mock_rpc_client.rpc.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_consolidate_utxos_requests_address_alongside_listunspent(mock_rpc_client):
+    """Without an address, getnewaddress goes out concurrently with listunspent."""
+    in_flight: set[str] = set()
+    overlapped = False
+
+    async def rpc(method, params=None, wallet=""):
+        nonlocal overlapped
+        in_flight.add(method)
+        await asyncio.sleep(0)
+        overlapped = overlapped or {"listunspent", "getnewaddress"} <= in_flight
+        in_flight.discard(method)
+        return {
+            "listunspent": [{"txid": "aa" * 32, "vout": 0, "amount": 0.01}],
+            "getnewaddress": "bcrt1qfresh",
+            "sendall": {"txid": "txid_consolidated"},
+        }[method]
+
+    mock_rpc_client.rpc.side_effect = rpc
+
+    tool = ConsolidateUtxosTool(mock_rpc_client)
+    result = await tool.execute({})
+
+    assert result.success
+    assert overlapped
+    assert "bcrt1qfresh" in result.output
+    sendall = next(c for c in mock_rpc_client.rpc.call_args_list if c.args[0] == "sendall")
+    assert sendall.args[1][0] == ["bcrt1qfresh"]
+
+
+@pytest.mark.asyncio
+async def test_consolidate_utxos_address_error_is_reported(mock_rpc_client):
+    """A failed getnewaddress surfaces as an RPC error and nothing is spent."""
+
+    async def rpc(method, params=None, wallet=""):
+        if method == "getnewaddress":
+            raise RuntimeError("RPC error: {'code': -12, 'message': 'Keypool ran out'}")
+        return [{"txid": "aa" * 32, "vout": 0, "amount": 0.01}]
+
+    mock_rpc_client.rpc.side_effect = rpc
+
+    tool = ConsolidateUtxosTool(mock_rpc_client)
+    result = await tool.execute({})
+
+    assert not result.success
+    assert "Keypool ran out" in result.error["message"]
+    assert "sendall" not in [c.args[0] for c in mock_rpc_client.rpc.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_consolidate_utxos_spends_outpoints_in_caller_order(mock_rpc_client):
+    """Given outpoints, sendall inputs follow the caller's order, not listunspent's."""
+    txid_a, txid_b = "aa" * 32, "bb" * 32
+    mock_rpc_client.rpc.side_effect = [
+        [
+            {"txid": txid_a, "vout": 0, "amount": 0.01, "confirmations": 10},
+            {"txid": txid_b, "vout": 1, "amount": 0.02, "confirmations": 5},
+        ],
+        {"txid": "txid_consolidated"},
+    ]
+
+    tool = ConsolidateUtxosTool(mock_rpc_client)
+    result = await tool.execute(
+        {"outpoints": [f"{txid_b}:1", f"{txid_a}:0"], "address": "bcrt1qdest"}
+    )
+
+    assert result.success
+    inputs = mock_rpc_client.rpc.call_args_list[1].args[1][4]["inputs"]
+    assert inputs == [{"txid": txid_b, "vout": 1}, {"txid": txid_a, "vout": 0}]
+
+
+@pytest.mark.asyncio
+async def test_consolidate_utxos_amount_filters_set_inputs_and_total(mock_rpc_client):
+    """Given min/max amount filters, only in-range UTXOs are spent and totalled."""
+    mock_rpc_client.rpc.side_effect = [
+        [
+            {"txid": "aa" * 32, "vout": 0, "amount": 0.00001, "confirmations": 3},
+            {"txid": "bb" * 32, "vout": 1, "amount": 0.0002, "confirmations": 3},
+            {"txid": "cc" * 32, "vout": 2, "amount": 0.0003, "confirmations": 3},
+            {"txid": "dd" * 32, "vout": 3, "amount": 0.5, "confirmations": 3},
+        ],
+        {"txid": "txid_consolidated"},
+    ]
+
+    tool = ConsolidateUtxosTool(mock_rpc_client)
+    result = await tool.execute(
+        {"address": "bcrt1qdest", "min_amount_sats": 20_000, "max_amount_sats": 30_000}
+    )
+
+    assert result.success
+    assert "Consolidated 2 UTXO(s)" in result.output
+    assert "50,000 sats" in result.output
+    inputs = mock_rpc_client.rpc.call_args_list[1].args[1][4]["inputs"]
+    assert inputs == [{"txid": "bb" * 32, "vout": 1}, {"txid": "cc" * 32, "vout": 2}]
+
+
 # ---------------------------------------------------------------------------
 # MineBlocksTool
 # ---------------------------------------------------------------------------
@@ -267,7 +701,8 @@ async def test_consolidate_utxos_outpoint_filter_selects_subset(mock_rpc_client)
 @pytest.mark.asyncio
 async def test_mine_blocks_count_and_reward(mock_rpc_client):
     """Mining N blocks reports the correct block count and reward in sats."""
-    mock_rpc_client.rpc.return_value = ["hash_a", "hash_b", "hash_c"]
+    mock_rpc_client.rpc.return_value = {"chain": "regtest"}
+    mock_rpc_client.rpc_batch.return_value = [["hash_a", "hash_b", "hash_c"], 3]
 
     tool = MineBlocksTool(mock_rpc_client)
     result = await tool.execute({"num_blocks": 3, "address": "bcrt1qminer"})
@@ -277,12 +712,55 @@ async def test_mine_blocks_count_and_reward(mock_rpc_client):
     # 3 blocks * 50 BTC * 1e8 = 15,000,000,000 sats
     assert "15,000,000,000" in result.output
     assert "hash_a" in result.output
+    mock_rpc_client.rpc_batch.assert_awaited_once_with(
+        [("generatetoaddress", [3, "bcrt1qminer"]), ("getblockcount", [])]
+    )
+
+
+@pytest.mark.asyncio
+async def test_mine_blocks_reward_follows_regtest_halvings(mock_rpc_client):
+    """Blocks 149-151 straddle regtest's first halving at height 150."""
+    mock_rpc_client.rpc.return_value = {"chain": "regtest"}
+    mock_rpc_client.rpc_batch.return_value = [["h149", "h150", "h151"], 151]
+
+    tool = MineBlocksTool(mock_rpc_client)
+    result = await tool.execute({"num_blocks": 3, "address": "bcrt1qminer"})
+
+    assert result.success
+    # 50 BTC + 25 BTC + 25 BTC
+    assert "10,000,000,000 sats (100.00000000 BTC immature)" in result.output
+
+
+@pytest.mark.asyncio
+async def test_mine_blocks_fetches_chain_once(mock_rpc_client):
+    """The chain name is cached on the client after the first mine."""
+    mock_rpc_client.rpc.return_value = {"chain": "regtest"}
+    mock_rpc_client.rpc_batch.return_value = [["hash_one"], 1]
+
+    tool = MineBlocksTool(mock_rpc_client)
+    await tool.execute({"num_blocks": 1, "address": "bcrt1qminer"})
+    await tool.execute({"num_blocks": 1, "address": "bcrt1qminer"})
+
+    mock_rpc_client.rpc.assert_awaited_once_with("getblockchaininfo")
+
+
+@pytest.mark.asyncio
+async def test_mine_blocks_chain_lookup_failure_mines_nothing(mock_rpc_client):
+    """A failed chain lookup returns an error before any block is mined."""
+    mock_rpc_client.rpc.side_effect = RuntimeError("RPC error: {'code': -28}")
+
+    tool = MineBlocksTool(mock_rpc_client)
+    result = await tool.execute({"num_blocks": 1, "address": "bcrt1qminer"})
+
+    assert not result.success
+    mock_rpc_client.rpc_batch.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_mine_blocks_warns_under_101(mock_rpc_client):
     """Mining < 101 blocks warns about coinbase maturity."""
-    mock_rpc_client.rpc.return_value = ["hash_one"]
+    mock_rpc_client.rpc.return_value = {"chain": "regtest"}
+    mock_rpc_client.rpc_batch.return_value = [["hash_one"], 1]
 
     tool = MineBlocksTool(mock_rpc_client)
     result = await tool.execute({"num_blocks": 1, "address": "bcrt1qminer"})
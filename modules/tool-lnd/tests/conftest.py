@@ -1,7 +1,6 @@
 """Provide a minimal amplifier_core stub and shared test helpers."""
 
 import sys
-import types
 from pathlib import Path
 from unittest.mock import AsyncMock
 
@@ -13,29 +12,9 @@ import pytest
 # restores that import for every test module.
 sys.path.insert(0, str(Path(__file__).parent))
 
+from _amplifier_stub import install as install_amplifier_core_stub  # noqa: E402
 
-def _install_amplifier_core_stub() -> None:
-    if "amplifier_core" in sys.modules:
-        return
-    mod = types.ModuleType("amplifier_core")
-
-    class ToolResult:
-        def __init__(
-            self,
-            success: bool = True,
-            output: str | None = None,
-            error: dict | None = None,  # noqa: UP006
-        ):
-            self.success = success
-            self.output = output
-            self.error = error
-
-    mod.ToolResult = ToolResult  # type: ignore[attr-defined]
-    mod.ModuleCoordinator = type("ModuleCoordinator", (), {})  # type: ignore[attr-defined]
-    sys.modules["amplifier_core"] = mod
-
-
-_install_amplifier_core_stub()
+install_amplifier_core_stub()
 
 
 def make_test_client(lnd_client):